@@ -20,7 +20,9 @@ MASTER_KEY_FILE = os.path.join(PROFILE_DIR, ".master")
 IDLE_TIMEOUT_SECS = 180
 CLIPBOARD_CHECK_INTERVAL_MS = 2000
 TOTP_REFRESH_INTERVAL_MS = 1000
+TOTP_FULL_REFRESH_MS = 30_000
 IDLE_CHECK_INTERVAL_MS = 10_000
+MASTER_KDF_ITERATIONS = 600_000
 
 # UI
 WINDOW_MIN_WIDTH = 800
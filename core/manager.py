@@ -5,32 +5,45 @@ import os
 import json
 import time
 import re
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
-    QMessageBox, QInputDialog, QLineEdit, QFileDialog, QTableWidgetItem, QApplication
+    QMessageBox, QInputDialog, QLineEdit, QFileDialog, QApplication, QProgressDialog
 )
-from PyQt5.QtCore import QTimer
-import pyotp
+from PyQt5.QtCore import Qt, QTimer, QObject, QThreadPool, pyqtSignal
 
-from config import PROFILE_DIR, MASTER_KEY_FILE, IDLE_TIMEOUT_SECS
+from config import MASTER_KEY_FILE, IDLE_TIMEOUT_SECS
 from services.auth_service import AuthService
 from services.profile_service import ProfileService
 from services.qr_service import QRService
 from services.totp_service import TOTPService
-from services.qr_parser import parse_otpauth_uri, QRParser
+from services.qr_parser import parse_otpauth_uri, clear_parse_cache, QRParser
 from ui.actions_builder import ActionsBuilder
-from core.totp_crypto import encrypt_secret, decrypt_secret
+from core.totp_crypto import encrypt_secret, decrypt_secret, clear_key_caches
+from utils.workers import Worker
+
+# Characters not allowed in profile / file names
+_SAFE_NAME_RE = re.compile(r"[^\w.@-]")
+
+
+class _ProfileLoadSignals(QObject):
+    """Delivers profiles decrypted on worker threads to the GUI thread."""
+    
+    loaded = pyqtSignal(int, str, object)  # generation, name, data
+    failed = pyqtSignal(int, str, str)  # generation, name, error
 
 
 class TOTPManagerCore:
     """Core business logic for TOTP Manager."""
     
-    def __init__(self, master_pw, master_key, ui_builder):
+    def __init__(self, master_pw, master_key, ui_builder, encrypted_master=None):
         self.master_pw = master_pw
         self.master_key = master_key
+        self.encrypted_master = encrypted_master
         self.ui_builder = ui_builder
         
         # Services
-        self.profile_service = ProfileService(master_pw)
+        self.profile_service = ProfileService(master_pw, master_key)
         self.qr_service = QRService()
         self.totp_service = TOTPService()
         self.auth_service = AuthService()
@@ -39,6 +52,21 @@ class TOTPManagerCore:
         # Data
         self.profiles = {}
         self.active_profile = None
+        self._shown_codes = {}  # name -> text currently in the code column
+        
+        # Background profile loading
+        self._load_pool = ThreadPoolExecutor()
+        self._load_generation = 0
+        self._load_signals = _ProfileLoadSignals()
+        self._load_signals.loaded.connect(self._on_profile_loaded)
+        self._load_signals.failed.connect(self._on_profile_load_failed)
+        # Profiles that arrived since the last flush; added to the table together
+        self._loaded_batch = {}
+        # name -> position in the profile listing, which sets the table order
+        self._load_order = {}
+        self._load_flush_timer = QTimer()
+        self._load_flush_timer.setSingleShot(True)
+        self._load_flush_timer.timeout.connect(self._flush_loaded_profiles)
         
         # UI Actions
         self.actions_builder = ActionsBuilder(ui_builder.main_window, self)
@@ -47,69 +75,206 @@ class TOTPManagerCore:
         self.actions_builder.create_toolbar()
         
         # Connections
-        self.ui_builder.profile_table.cellClicked.connect(self.load_profile)
+        self.ui_builder.profile_table.clicked.connect(self._on_profile_clicked)
         
         # Clipboard state
-        self.last_clipboard_text = ""
+        self.last_clipboard_hash = 0
+        
+        # QR workers still running; referenced here until they report back
+        self._qr_workers = set()
+        
+        # Unlock state
+        self._unlocking = False
+        self._unlock_progress = None
+        self._unlock_worker = None
+        
+        # Status label stylesheets by color
+        self._status_ss = {}
+        self._status_color = None
+        self._status_timer = QTimer()
+        self._status_timer.setSingleShot(True)
+        self._status_timer.timeout.connect(self._reset_status)
     
     def load_profiles(self):
-        """Load all profiles from disk."""
-        self.profiles.clear()
-        self.ui_builder.profile_table.setRowCount(0)
+        """
+        Load all profiles from disk.
+
+        Profiles are decrypted on a thread pool and added to the table as
+        they arrive; results from an earlier, superseded call are dropped.
+        """
+        self._clear_loaded_profiles()
+        generation = self._load_generation
         
-        for f in os.listdir(PROFILE_DIR):
-            if f.endswith(".enc"):
-                name = f[:-4]
-                try:
-                    data = self.profile_service.load_profile(name)
-                    if data:
-                        self.profiles[name] = data
-                        row = self.ui_builder.profile_table.rowCount()
-                        self.ui_builder.profile_table.insertRow(row)
-                        self.ui_builder.profile_table.setItem(row, 0, QTableWidgetItem(name))
-                        self.ui_builder.profile_table.setItem(row, 1, QTableWidgetItem(""))
-                except Exception as e:
-                    self.update_status(f"[Error] Loading '{name}': {e}", color="red", duration_ms=5000)
+        self._load_order = {}
+        for index, name in enumerate(self.profile_service.list_profiles()):
+            self._load_order[name] = index
+            self._load_pool.submit(self._load_in_background, generation, name)
+    
+    def _clear_loaded_profiles(self):
+        """
+        Forget every decrypted profile and what was derived from it.
+
+        Also drops results of loads still in flight and resets the table,
+        code and QR views.
+        """
+        self._load_generation += 1
+        self.profiles.clear()
+        self._shown_codes.clear()
+        self._loaded_batch.clear()
+        self.totp_service.clear()
+        self.ui_builder.profile_model.clear()
         
         self.active_profile = None
         self.ui_builder.label.setText("🔄 Select a profile or upload QR code")
-        self.ui_builder.qr_label.clear()
+        self.ui_builder.qr_label.setPixmap(self.ui_builder.qr_placeholder)
         self.ui_builder.totp_label.setText("TOTP Code:")
+    
+    def _load_in_background(self, generation, name):
+        """Decrypt one profile on a worker thread."""
+        try:
+            data = self.profile_service.load_profile(name)
+        except Exception as e:
+            self._load_signals.failed.emit(generation, name, str(e))
+            return
+        # load_profile returns None for unreadable or undecryptable files
+        if not data:
+            self._load_signals.failed.emit(generation, name, "could not be read or decrypted")
+            return
+        self.totp_service.prepare(data)
+        self._load_signals.loaded.emit(generation, name, data)
+    
+    def _on_profile_loaded(self, generation, name, data):
+        """Queue a decrypted profile for the next batched table update."""
+        if generation == self._load_generation:
+            self._loaded_batch[name] = data
+            self._load_flush_timer.start(0)
+    
+    def _flush_loaded_profiles(self):
+        """Add every profile loaded since the last flush to the table in one pass."""
+        batch, self._loaded_batch = self._loaded_batch, {}
+        if not batch:
+            return
+        new_names = [name for name in batch if name not in self.profiles]
+        for name in batch:
+            self._shown_codes.pop(name, None)
+        self.profiles.update(batch)
+        if new_names:
+            self._insert_in_load_order(new_names)
         self.refresh_totps()
     
+    def _insert_in_load_order(self, names):
+        """
+        Insert rows for newly loaded profiles at their place in the listing.
+
+        Workers finish in any order, so a batch may belong above rows that
+        are already shown. Rows added after loading (imports) stay last.
+        """
+        model = self.ui_builder.profile_model
+        order = self._load_order
+        last = len(order)
+        shown = [order.get(model.name(row), last) for row in range(model.rowCount())]
+        runs = {}
+        for name in sorted(names, key=order.__getitem__):
+            runs.setdefault(bisect_left(shown, order[name]), []).append(name)
+        # Bottom up, so the insertion rows above stay valid
+        for row in sorted(runs, reverse=True):
+            model.insert_rows(row, runs[row])
+    
+    def _on_profile_load_failed(self, generation, name, error):
+        """Report a profile that could not be loaded."""
+        if generation == self._load_generation:
+            self.update_status(f"[Error] Loading '{name}': {error}", color="red", duration_ms=5000)
+    
+    def _on_profile_clicked(self, index):
+        """Load the profile of a clicked table cell."""
+        self.load_profile(index.row(), index.column())
+    
     def load_profile(self, row, column):
         """Load selected profile."""
-        profile_name = self.ui_builder.profile_table.item(row, 0).text()
+        profile_name = self.ui_builder.profile_model.name(row)
         data = self.profiles.get(profile_name)
         if not data:
             return
         
         self.active_profile = data
         self.ui_builder.label.setText(f"🧾 Profile: {profile_name}")
-        self.ui_builder.totp_label.setText(f"⏱️ Code: {pyotp.TOTP(data['secret']).now()}")
+        code, _ = self.totp_service.generate_totp(data)
+        self.ui_builder.totp_label.setText(f"⏱️ Code: {code}")
         
         # Display QR
         uri = f"otpauth://totp/{data['label']}?secret={data['secret']}&issuer={data['issuer']}"
         pixmap = self.qr_service.generate_qr_pixmap(uri)
         self.ui_builder.qr_label.setPixmap(pixmap)
     
+    def refresh_profile(self, name, data):
+        """
+        Insert or update the table row of a single profile.
+
+        Returns:
+            int: Row of the profile
+        """
+        self.profiles[name] = data
+        row = self._find_row(name)
+        if row is None:
+            row = self._append_row(name)
+        now_ns = time.time_ns()
+        codes = self.totp_service.generate_batch({name: data}, now_ns)
+        self._refresh_row(row, now_ns // 1_000_000_000, codes)
+        return row
+    
+    def _find_row(self, name):
+        """Find the table row showing a profile."""
+        return self.ui_builder.profile_model.find_row(name)
+    
+    def _append_row(self, name):
+        """Append an empty table row for a profile."""
+        self._shown_codes.pop(name, None)
+        return self.ui_builder.append_profile_rows([name])
+    
     def refresh_totps(self):
-        """Refresh all TOTP codes."""
-        for row in range(self.ui_builder.profile_table.rowCount()):
-            name_item = self.ui_builder.profile_table.item(row, 0)
-            if not name_item:
-                continue
-            name = name_item.text()
-            data = self.profiles.get(name)
-            if data:
-                try:
-                    code, remaining = self.totp_service.generate_totp(data)
-                    code_display = f"{code} ⏱️({remaining}s)"
-                    self.ui_builder.profile_table.setItem(row, 1, QTableWidgetItem(code_display))
-                    if self.active_profile == data:
-                        self.ui_builder.totp_label.setText(code_display)
-                except Exception:
-                    self.ui_builder.profile_table.setItem(row, 1, QTableWidgetItem("❌ Error"))
+        """
+        Refresh all TOTP codes.
+
+        TOTPService remembers each profile's code for the current time step,
+        so an HMAC is only computed for profiles whose step has rolled over.
+        """
+        now_ns = time.time_ns()
+        codes = self.totp_service.generate_batch(self.profiles, now_ns)
+        now = now_ns // 1_000_000_000
+        for row in range(self.ui_builder.profile_model.rowCount()):
+            self._refresh_row(row, now, codes)
+    
+    def update_remaining_only(self):
+        """
+        Update the countdown of every row.
+
+        Same as refresh_totps: codes that have not expired come from the
+        service's per-step cache, expired ones are regenerated.
+        """
+        self.refresh_totps()
+    
+    def _refresh_row(self, row, now, codes):
+        """Refresh the TOTP code shown in one table row (now in whole seconds)."""
+        name = self.ui_builder.profile_model.name(row)
+        data = self.profiles.get(name)
+        if data:
+            cached = codes.get(name)
+            if not cached:
+                self._set_code_text(row, name, "❌ Error")
+                return
+            _, interval, code = cached
+            remaining = interval - now % interval
+            code_display = f"{code} ⏱️({remaining}s)"
+            self._set_code_text(row, name, code_display)
+            if self.active_profile == data:
+                self.ui_builder.totp_label.setText(code_display)
+    
+    def _set_code_text(self, row, name, text):
+        """Set the code column text, skipping rows that already show it."""
+        if self._shown_codes.get(name) == text:
+            return
+        self._shown_codes[name] = text
+        self.ui_builder.profile_model.set_code(row, text)
     
     def upload_qr(self):
         """Upload QR code from file."""
@@ -121,14 +286,19 @@ class TOTPManagerCore:
         if not fname:
             return
         
+        self._run_qr_worker(self._on_qr_decoded, self.qr_service.decode_qr_file, fname, self.master_pw)
+    
+    def _on_qr_decoded(self, uri, error):
+        """Import the profile from a QR code decoded in the background."""
         try:
-            uri = self.qr_service.decode_qr_file(fname, self.master_pw)
+            if error:
+                raise ValueError(error)
             if not uri:
                 raise ValueError("No QR code detected in this file.")
             
             # Parse the URI
             parsed = parse_otpauth_uri(uri)
-            name = re.sub(r"[^\w.@-]", "_", parsed["label"])
+            name = _SAFE_NAME_RE.sub("_", parsed["label"])
             
             if self.profile_service.profile_exists(name):
                 if QMessageBox.question(self.ui_builder.main_window, "Overwrite?",
@@ -137,13 +307,9 @@ class TOTPManagerCore:
                     return
             
             self.profile_service.save_profile(name, parsed)
-            self.load_profiles()
-            
-            for row in range(self.ui_builder.profile_table.rowCount()):
-                if self.ui_builder.profile_table.item(row, 0).text() == name:
-                    self.ui_builder.profile_table.selectRow(row)
-                    self.load_profile(row, 0)
-                    break
+            row = self.refresh_profile(name, parsed)
+            self.ui_builder.profile_table.selectRow(row)
+            self.load_profile(row, 0)
             
             self.update_status(f"Imported '{name}'", color="lime")
         except Exception as e:
@@ -159,7 +325,7 @@ class TOTPManagerCore:
             data = self.active_profile
             uri = f"otpauth://totp/{data['label']}?secret={data['secret']}&issuer={data.get('issuer','')}"
             
-            default_name = re.sub(r"[^\w.@-]", "_", data["label"]) + "_qr.enc"
+            default_name = _SAFE_NAME_RE.sub("_", data["label"]) + "_qr.enc"
             save_path, _ = QFileDialog.getSaveFileName(
                 self.ui_builder.main_window,
                 "Save Encrypted QR",
@@ -168,19 +334,40 @@ class TOTPManagerCore:
             )
             
             if save_path:
-                self.qr_service.save_qr_encrypted(uri, save_path, self.master_pw)
-                self.update_status(f"Encrypted QR saved: {save_path}", color="lime")
+                self._run_qr_worker(
+                    lambda _, error: self._on_qr_saved(save_path, error),
+                    self.qr_service.save_qr_encrypted, uri, save_path, self.master_pw
+                )
         except Exception as e:
             self.update_status(f"QR Save Error: {e}", color="red")
     
+    def _on_qr_saved(self, save_path, error):
+        """Report the result of a background QR save."""
+        if error:
+            self.update_status(f"QR Save Error: {error}", color="red")
+        else:
+            self.update_status(f"Encrypted QR saved: {save_path}", color="lime")
+    
+    def _run_qr_worker(self, callback, fn, *args):
+        """Run fn(*args) on the thread pool and pass (result, error) to callback."""
+        worker = Worker(fn, *args)
+        
+        def finished(result, error):
+            self._qr_workers.discard(worker)
+            callback(result, error)
+        
+        worker.signals.finished.connect(finished)
+        self._qr_workers.add(worker)
+        QThreadPool.globalInstance().start(worker)
+    
     def delete_profile(self):
         """Delete selected profile."""
-        row = self.ui_builder.profile_table.currentRow()
+        row = self.ui_builder.profile_table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self.ui_builder.main_window, "No Selection", "Select a profile to delete.")
             return
         
-        name = self.ui_builder.profile_table.item(row, 0).text()
+        name = self.ui_builder.profile_model.name(row)
         
         confirm = QMessageBox.question(
             self.ui_builder.main_window, "Confirm Delete",
@@ -191,10 +378,13 @@ class TOTPManagerCore:
         if confirm == QMessageBox.Yes:
             try:
                 self.profile_service.delete_profile(name)
-                self.profiles.pop(name, None)
-                self.ui_builder.profile_table.removeRow(row)
+                data = self.profiles.pop(name, None)
+                self._shown_codes.pop(name, None)
+                if data is not None:
+                    self.totp_service.discard(data)
+                self.ui_builder.profile_model.remove_row(row)
                 self.ui_builder.label.setText("🔄 Select a profile or upload QR")
-                self.ui_builder.qr_label.clear()
+                self.ui_builder.qr_label.setPixmap(self.ui_builder.qr_placeholder)
                 self.ui_builder.totp_label.setText("TOTP Code:")
                 self.active_profile = None
             except Exception as e:
@@ -202,13 +392,18 @@ class TOTPManagerCore:
     
     def check_clipboard(self):
         """Monitor clipboard for OTP URIs."""
+        if self._unlocking:
+            return
         clipboard = QApplication.clipboard()
         text = clipboard.text()
-        if text != self.last_clipboard_text and text.startswith("otpauth://"):
-            self.last_clipboard_text = text
+        if not text.startswith("otpauth://"):
+            return
+        text_hash = hash(text)
+        if text_hash != self.last_clipboard_hash:
+            self.last_clipboard_hash = text_hash
             try:
                 parsed = parse_otpauth_uri(text)
-                name = re.sub(r'[^\w.@-]', '_', parsed['label'])
+                name = _SAFE_NAME_RE.sub('_', parsed['label'])
                 
                 if self.profile_service.profile_exists(name):
                     reply = QMessageBox.question(self.ui_builder.main_window, "Overwrite?", f"Profile '{name}' exists. Overwrite?",
@@ -217,7 +412,7 @@ class TOTPManagerCore:
                         return
                 
                 self.profile_service.save_profile(name, parsed)
-                self.load_profiles()
+                self.refresh_profile(name, parsed)
                 self.update_status("Clipboard Imported", f"Imported: {name}")
             except Exception as e:
                 self.update_status("Invalid OTP URI", f"Error: {str(e)}", color="red", duration_ms=5000)
@@ -225,7 +420,10 @@ class TOTPManagerCore:
     def change_master_password(self):
         """Change master password."""
         self.auth_service.change_master_password(self.ui_builder.main_window, self.profile_service)
-        self.master_pw = self.auth_service.master_pw
+        if self.auth_service.master_pw:
+            self.master_pw = self.auth_service.master_pw
+            self.encrypted_master = self.auth_service.encrypted_master
+            self.profile_service.master_pw = self.master_pw
         self.load_profiles()
     
     def reset_master_key(self):
@@ -238,43 +436,63 @@ class TOTPManagerCore:
         self.profile_service.reset_all_profiles()
         if os.path.exists(MASTER_KEY_FILE):
             os.remove(MASTER_KEY_FILE)
+        clear_key_caches()
         QMessageBox.information(self.ui_builder.main_window, "Reset Done", "Master key and all profiles reset. Restart application.")
         QApplication.quit()
     
     def lock_application(self):
         """Lock application."""
-        pw, ok = QInputDialog.getText(self.ui_builder.main_window, "Session Locked", "Re-enter master password:", QLineEdit.Password)
-        if not ok or not pw:
-            QApplication.quit()
-        
-        try:
-            with open(MASTER_KEY_FILE, "r") as f:
-                encrypted_master = f.read()
-            master_key = decrypt_secret(encrypted_master, pw)
-            self.master_key = master_key
-        except Exception:
-            QMessageBox.critical(self.ui_builder.main_window, "Access Denied", "Incorrect password.")
-            QApplication.quit()
+        self._unlock()
     
     def check_idle(self, last_activity_time):
-        """Check idle timeout."""
-        if time.time() - last_activity_time > IDLE_TIMEOUT_SECS:
-            self._lock_interface()
+        """Check idle timeout; last_activity_time is a time.monotonic() value."""
+        if time.monotonic() - last_activity_time > IDLE_TIMEOUT_SECS:
+            self._unlock()
     
-    def _lock_interface(self):
-        """Lock interface."""
+    def _unlock(self):
+        """Prompt for the master password and decrypt the cached master key."""
+        if self._unlocking:
+            return
+        self._unlocking = True
+        # Nothing decrypted stays in memory or on screen while locked. With
+        # no profiles left the refresh timers have nothing to regenerate;
+        # the profiles are loaded again once the password is accepted.
+        self._clear_loaded_profiles()
+        self.master_key = None
+        clear_parse_cache()
+        clear_key_caches()
+        self.qr_service.clear_cache()
+        
         pw, ok = QInputDialog.getText(self.ui_builder.main_window, "Session Locked", "Re-enter master password:", QLineEdit.Password)
         if not ok or not pw:
             QApplication.quit()
+            return
         
-        try:
-            with open(MASTER_KEY_FILE, "r") as f:
-                encrypted_master = f.read()
-            master_key = decrypt_secret(encrypted_master, pw)
-            self.master_key = master_key
-        except Exception:
+        # Key derivation runs on the thread pool; keep a busy indicator up meanwhile
+        self._unlock_progress = QProgressDialog("Unlocking...", None, 0, 0, self.ui_builder.main_window)
+        self._unlock_progress.setWindowModality(Qt.WindowModal)
+        self._unlock_progress.setMinimumDuration(0)
+        self._unlock_progress.show()
+        
+        self._unlock_worker = Worker(decrypt_secret, self.encrypted_master, pw)
+        self._unlock_worker.signals.finished.connect(self._on_unlock_finished)
+        QThreadPool.globalInstance().start(self._unlock_worker)
+    
+    def _on_unlock_finished(self, master_key, error):
+        """Handle the result of an unlock attempt."""
+        self._unlock_progress.close()
+        self._unlock_progress = None
+        self._unlock_worker = None
+        self._unlocking = False
+        
+        if master_key is None:
             QMessageBox.critical(self.ui_builder.main_window, "Access Denied", "Incorrect password.")
             QApplication.quit()
+            return
+        self.master_key = master_key
+        # The idle clock restarts at unlock, not at the input before the lock
+        self.ui_builder.main_window.last_activity_time = time.monotonic()
+        self.load_profiles()
     
     def reset_vault(self):
         """Reset entire vault."""
@@ -297,11 +515,14 @@ class TOTPManagerCore:
                 os.remove(MASTER_KEY_FILE)
             
             self.profiles.clear()
+            self._shown_codes.clear()
+            self._loaded_batch.clear()
+            self.totp_service.clear()
+            clear_key_caches()
             self.active_profile = None
-            self.ui_builder.profile_table.setRowCount(0)
+            self.ui_builder.profile_model.clear()
             self.ui_builder.totp_label.setText("------")
-            self.ui_builder.qr_label.setText("No QR Code")
-            self.ui_builder.qr_label.clear()
+            self.ui_builder.qr_label.setPixmap(self.ui_builder.qr_placeholder)
             
             QMessageBox.information(self.ui_builder.main_window, "Vault Reset", "Vault successfully reset.\nAll data has been removed.")
             self.ui_builder.main_window.close()
@@ -325,13 +546,23 @@ class TOTPManagerCore:
             full_text = message
         
         self.ui_builder.status_label.setText(full_text)
-        self.ui_builder.status_label.setStyleSheet(f"""
-            QLabel {{
-                color: {color};
-                background-color: #222;
-                border-radius: 6px;
-                padding: 6px;
-            }}
-        """)
+        if color != self._status_color:
+            style = self._status_ss.get(color)
+            if style is None:
+                style = self._status_ss[color] = f"""
+                    QLabel {{
+                        color: {color};
+                        background-color: #222;
+                        border-radius: 6px;
+                        padding: 6px;
+                    }}
+                """
+            self.ui_builder.status_label.setStyleSheet(style)
+            self._status_color = color
         
-        QTimer.singleShot(duration_ms, lambda: self.ui_builder.status_label.setText("Ready"))
\ No newline at end of file
+        # Restarting the timer replaces any reset still pending from an earlier message
+        self._status_timer.start(duration_ms)
+    
+    def _reset_status(self):
+        """Reset status label."""
+        self.ui_builder.status_label.setText("Ready")
\ No newline at end of file
@@ -1,47 +1,97 @@
-import base64, os, time, struct, hmac, hashlib
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes  # ✅ Add this import
-from cryptography.hazmat.backends import default_backend  # ✅ Required
+import base64, os, time, struct, hmac, hashlib, functools
 
-def derive_key_sha512(password: str, salt: bytes, iterations: int = 100_000) -> bytes:
-    return PBKDF2HMAC(
-        algorithm=hashes.SHA512(),  # ✅ Use this, not hashlib.sha256()
-        length=32,
-        salt=salt,
-        iterations=iterations,
-        backend=default_backend()
-    ).derive(password.encode())
+# cryptography is imported inside the functions that use it so loading this
+# module (and the app) does not pull in the OpenSSL bindings up front.
 
+@functools.lru_cache(maxsize=64)
 def derive_key(password: str, salt: bytes, iterations: int = 100_000) -> bytes:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
     return PBKDF2HMAC(
         algorithm=hashes.SHA256(),  # ✅ Use this, not hashlib.sha256()
         length=32,
         salt=salt,
-        iterations=iterations,
-        backend=default_backend()
+        iterations=iterations
     ).derive(password.encode())
 
-def encrypt_secret(secret: str, password: str) -> str:
+# Payload header: magic, version byte and a 3-byte PBKDF2 iteration count, so
+# the count can differ per payload. Payloads without it use 100k iterations.
+KDF_HEADER = b"TKX\x01"
+DEFAULT_ITERATIONS = 100_000
+
+@functools.lru_cache(maxsize=16)
+def _aesgcm(key: bytes):
+    # Long-lived keys (derived keys, the KEK) reuse one cipher context
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    return AESGCM(key)
+
+def clear_key_caches():
+    # Drop memoized password-derived keys and cipher contexts (lock, reset)
+    derive_key.cache_clear()
+    _aesgcm.cache_clear()
+
+def encrypt_secret(secret: str, password: str, iterations: int = DEFAULT_ITERATIONS) -> str:
     salt = os.urandom(16)
-    key = derive_key(password, salt)
-    aesgcm = AESGCM(key)
+    key = derive_key(password, salt, iterations)
+    aesgcm = _aesgcm(key)
     nonce = os.urandom(12)
     data = secret.encode()
     enc = aesgcm.encrypt(nonce, data, None)
-    return base64.b64encode(salt + nonce + enc).decode()
+    header = KDF_HEADER + iterations.to_bytes(3, "big")
+    return base64.b64encode(header + salt + nonce + enc).decode()
+
+def _decrypt_raw(raw: bytes, password: str, iterations: int) -> bytes:
+    salt, nonce, ct = raw[:16], raw[16:28], raw[28:]
+    key = derive_key(password, salt, iterations)
+    aesgcm = _aesgcm(key)
+    return aesgcm.decrypt(nonce, ct, None)
 
 def decrypt_secret(payload: str, password: str) -> str:
+    from cryptography.exceptions import InvalidTag
     raw = base64.b64decode(payload)
-    salt, nonce, ct = raw[:16], raw[16:28], raw[28:]
-    key = derive_key(password, salt)
-    aesgcm = AESGCM(key)
-    return aesgcm.decrypt(nonce, ct, None).decode()
+    if raw.startswith(KDF_HEADER):
+        iterations = int.from_bytes(raw[4:7], "big")
+        try:
+            return _decrypt_raw(raw[7:], password, iterations).decode()
+        except InvalidTag:
+            pass  # headerless payload whose salt happens to match the header
+    return _decrypt_raw(raw, password, DEFAULT_ITERATIONS).decode()
+
+# Profiles are encrypted with a random data key (DK) wrapped by a key-encryption
+# key (KEK), so unlocking a profile is two AES-GCM operations instead of PBKDF2.
+WRAPPED_KEY_LEN = 12 + 32 + 16
+
+def wrap_key(kek: bytes, dk: bytes) -> bytes:
+    nonce = os.urandom(12)
+    return nonce + _aesgcm(kek).encrypt(nonce, dk, None)
+
+def unwrap_key(kek: bytes, wrapped: bytes) -> bytes:
+    nonce, ct = wrapped[:12], wrapped[12:]
+    return _aesgcm(kek).decrypt(nonce, ct, None)
+
+def encrypt_with_kek(data: bytes, kek: bytes) -> bytes:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    dk = AESGCM.generate_key(bit_length=256)
+    nonce = os.urandom(12)
+    return wrap_key(kek, dk) + nonce + AESGCM(dk).encrypt(nonce, data, None)
+
+def decrypt_with_kek(payload: bytes, kek: bytes) -> bytes:
+    wrapped = payload[:WRAPPED_KEY_LEN]
+    nonce = payload[WRAPPED_KEY_LEN:WRAPPED_KEY_LEN + 12]
+    ct = payload[WRAPPED_KEY_LEN + 12:]
+    dk = unwrap_key(kek, wrapped)
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    return AESGCM(dk).decrypt(nonce, ct, None)
+
+# TOTP algorithm name (lowercase) -> hashlib constructor
+HASH_ALGORITHMS = {'sha1': hashlib.sha1, 'sha256': hashlib.sha256, 'sha512': hashlib.sha512}
 
-def generate_totp(secret: str, digits=6, interval=30, algo='sha512') -> str:
+def generate_totp(secret: str, digits=6, interval=30, algo='sha512', now=None) -> str:
+    if now is None:
+        now = time.time()
     key = base64.b32decode(secret, casefold=True)
-    counter = struct.pack(">Q", int(time.time() / interval))
-    h = hmac.new(key, counter, getattr(hashlib, algo)).digest()
+    counter = struct.pack(">Q", int(now / interval))
+    h = hmac.new(key, counter, HASH_ALGORITHMS[algo]).digest()
     o = h[-1] & 0x0F
     code = struct.unpack(">I", h[o:o+4])[0] & 0x7fffffff
     return str(code % (10 ** digits)).zfill(digits)
@@ -49,14 +99,16 @@ def generate_totp(secret: str, digits=6, interval=30, algo='sha512') -> str:
 def encrypt_bytes(data: bytes, password: str) -> bytes:
     salt = os.urandom(16)
     key = derive_key(password, salt)
-    aesgcm = AESGCM(key)
+    aesgcm = _aesgcm(key)
     nonce = os.urandom(12)
     enc = aesgcm.encrypt(nonce, data, None)
     return salt + nonce + enc
 
 def decrypt_bytes(data: bytes, password: str) -> bytes:
-    salt, nonce, ct = data[:16], data[16:28], data[28:]
+    # Slice through a memoryview so the ciphertext is not copied first
+    view = memoryview(data)
+    salt, nonce, ct = bytes(view[:16]), view[16:28], view[28:]
     key = derive_key(password, salt)
-    aesgcm = AESGCM(key)
+    aesgcm = _aesgcm(key)
     return aesgcm.decrypt(nonce, ct, None)
 
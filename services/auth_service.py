@@ -4,7 +4,7 @@ Authentication service with enhanced password dialog.
 import os
 import base64
 from PyQt5.QtWidgets import QInputDialog, QLineEdit, QMessageBox
-from config import MASTER_KEY_FILE
+from config import MASTER_KEY_FILE, MASTER_KDF_ITERATIONS
 from core.totp_crypto import encrypt_secret, decrypt_secret
 from ui.password_dialog import PasswordDialog
 
@@ -16,6 +16,7 @@ class AuthService:
     def __init__(self):
         self.master_pw = None
         self.master_key = None
+        self.encrypted_master = None
 
     def authenticate(self):
         """Authenticate user with master password."""
@@ -30,6 +31,7 @@ class AuthService:
                     encrypted_master = f.read()
                 self.master_key = decrypt_secret(encrypted_master, pw)
                 self.master_pw = pw
+                self.encrypted_master = encrypted_master
             except Exception:
                 QMessageBox.critical(None, "Error", "Incorrect master password or corrupted key file.")
                 import sys
@@ -41,9 +43,10 @@ class AuthService:
                 pw = dialog.get_password()
                 self.master_key = base64.urlsafe_b64encode(os.urandom(32)).decode()
                 self.master_pw = pw
-                encrypted = encrypt_secret(self.master_key, pw)
+                encrypted = encrypt_secret(self.master_key, pw, MASTER_KDF_ITERATIONS)
                 with open(MASTER_KEY_FILE, "w") as f:
                     f.write(encrypted)
+                self.encrypted_master = encrypted
             else:
                 import sys
                 sys.exit()
@@ -92,11 +95,12 @@ class AuthService:
             return
 
         # Update master key file
-        new_master = encrypt_secret(master_key, new_pw)
+        new_master = encrypt_secret(master_key, new_pw, MASTER_KDF_ITERATIONS)
         with open(MASTER_KEY_FILE, "w", encoding="utf-8") as f:
             f.write(new_master)
 
         self.master_pw = new_pw
+        self.encrypted_master = new_master
 
         QMessageBox.information(
             parent_window, "Success",
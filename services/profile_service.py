@@ -2,37 +2,71 @@
 Profile management service.
 """
 import os
-import json
+import base64
+import logging
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from config import PROFILE_DIR
-from core.totp_crypto import encrypt_secret, decrypt_secret
+from core.totp_crypto import encrypt_secret, decrypt_secret, encrypt_with_kek, decrypt_with_kek
+
+# Marks binary profiles whose data key is wrapped by the master key. Legacy
+# password-encrypted profiles are base64 text, which never contains NUL.
+PROFILE_MAGIC = b"\x00TKX"
+
+logger = logging.getLogger(__name__)
 
 
 class ProfileService:
     """Handles profile operations."""
     
-    def __init__(self, master_pw):
+    def __init__(self, master_pw, master_key=None):
         self.master_pw = master_pw
+        self.kek = base64.urlsafe_b64decode(master_key) if master_key else None
     
     def load_profile(self, name):
-        """Load profile from disk."""
+        """
+        Load profile from disk.
+
+        Password-encrypted profiles from older versions are rewritten under
+        the master key once they have been decrypted. A failed rewrite is
+        logged and the profile is still returned; it is retried next load.
+        """
         profile_path = os.path.join(PROFILE_DIR, name + ".enc")
-        if not os.path.exists(profile_path):
-            return None
-        
         try:
-            with open(profile_path, 'r', encoding='utf-8') as f:
-                encrypted = f.read()
-            decrypted = decrypt_secret(encrypted, self.master_pw)
-            return json.loads(decrypted)
+            with open(profile_path, 'rb') as f:
+                raw = f.read()
+            if raw.startswith(PROFILE_MAGIC):
+                decrypted = decrypt_with_kek(raw[len(PROFILE_MAGIC):], self.kek)
+                return orjson.loads(decrypted)
+            
+            data = orjson.loads(decrypt_secret(raw.decode('ascii'), self.master_pw))
         except Exception:
             return None
+        
+        if self.kek:
+            try:
+                self.save_profile(name, data)
+            except Exception as e:
+                logger.warning("Could not migrate profile '%s': %s", name, e)
+        return data
     
     def save_profile(self, name, data):
         """Save profile to disk."""
         profile_path = os.path.join(PROFILE_DIR, name + ".enc")
-        encrypted = encrypt_secret(json.dumps(data), self.master_pw)
-        with open(profile_path, 'w', encoding='utf-8') as f:
-            f.write(encrypted)
+        if self.kek:
+            payload = PROFILE_MAGIC + encrypt_with_kek(orjson.dumps(data), self.kek)
+        else:
+            payload = encrypt_secret(orjson.dumps(data).decode(), self.master_pw).encode('ascii')
+        self._write_atomic(profile_path, payload)
+    
+    @staticmethod
+    def _write_atomic(path, payload):
+        """Write bytes via a temp file so a crash never leaves a partial profile."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
     
     def delete_profile(self, name):
         """Delete profile."""
@@ -44,34 +78,57 @@ class ProfileService:
         """Check if profile exists."""
         return os.path.exists(os.path.join(PROFILE_DIR, name + ".enc"))
     
+    def _profile_entries(self):
+        """List directory entries of all stored profile files."""
+        with os.scandir(PROFILE_DIR) as it:
+            return [entry for entry in it if entry.name.endswith(".enc") and entry.is_file()]
+    
+    def list_profiles(self):
+        """List names of all stored profiles."""
+        return [entry.name[:-4] for entry in self._profile_entries()]
+    
     def reset_all_profiles(self):
         """Delete all profiles."""
-        for f in os.listdir(PROFILE_DIR):
-            if f.endswith(".enc"):
-                os.remove(os.path.join(PROFILE_DIR, f))
+        for entry in self._profile_entries():
+            os.remove(entry.path)
     
     def reencrypt_all_profiles(self, old_pw, new_pw):
-        """Re-encrypt all profiles with new password."""
+        """
+        Re-encrypt all profiles with new password.
+
+        Profiles wrapped by the master key do not depend on the password and
+        are left untouched. Files are processed on a thread pool since the
+        key derivation releases the GIL.
+        """
         failed = []
         succeeded = []
         
-        for f_name in os.listdir(PROFILE_DIR):
-            if not f_name.endswith(".enc"):
-                continue
-            
-            full_path = os.path.join(PROFILE_DIR, f_name)
-            try:
-                with open(full_path, "r", encoding="utf-8", errors="ignore") as pf:
-                    raw = pf.read().strip()
-                
-                decrypted = decrypt_secret(raw, old_pw)
-                new_enc = encrypt_secret(decrypted, new_pw)
-                
-                with open(full_path, "w", encoding="utf-8") as pf:
-                    pf.write(new_enc)
-                
-                succeeded.append(f_name)
-            except Exception:
-                failed.append(f_name)
+        entries = self._profile_entries()
+        if not entries:
+            return succeeded, failed
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            results = ex.map(self._reencrypt_one, entries, repeat(old_pw), repeat(new_pw))
+            for f_name, ok in results:
+                (succeeded if ok else failed).append(f_name)
         
         return succeeded, failed
+    
+    def _reencrypt_one(self, entry, old_pw, new_pw):
+        """Re-encrypt a single profile file; returns (file name, ok)."""
+        f_name, full_path = entry.name, entry.path
+        try:
+            with open(full_path, "rb") as pf:
+                raw = pf.read()
+            
+            if raw.startswith(PROFILE_MAGIC):
+                return f_name, True
+            
+            decrypted = decrypt_secret(raw.decode("ascii").strip(), old_pw)
+            new_enc = encrypt_secret(decrypted, new_pw)
+            
+            self._write_atomic(full_path, new_enc.encode("ascii"))
+            
+            return f_name, True
+        except Exception:
+            return f_name, False
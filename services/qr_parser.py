@@ -1,8 +1,46 @@
 """
 Parse otpauth:// URIs and extract TOTP/HOTP parameters.
 """
-from urllib.parse import urlparse, parse_qs
-import re
+import functools
+from collections import namedtuple
+from urllib.parse import unquote_plus
+
+# Byte lookup table for base32 validation: alphabet bytes (either case) map to
+# 0, everything else to 1, so one translate() call classifies the whole string.
+_B32_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz234567"
+_B32_TRANS = bytes.maketrans(
+    bytes(range(256)),
+    bytes(0 if c in _B32_ALPHABET else 1 for c in range(256))
+)
+
+# Supported hash algorithms, in the order they are listed in error messages
+_ALGORITHMS = ('SHA1', 'SHA256', 'SHA512', 'MD5')
+_VALID_ALGORITHMS = frozenset(_ALGORITHMS)
+
+# Immutable parse result; see QRParser.parse_otpauth_uri for the fields
+ParsedOTP = namedtuple('ParsedOTP', 'type label secret issuer algorithm digits period counter')
+
+# urlparse drops these anywhere in a URL; pasted URIs often end in a newline
+_URL_STRIP_CHARS = str.maketrans('', '', '\t\r\n')
+
+# Query tail of the URIs most authenticator exports produce
+_DEFAULT_QUERY_TAIL = ['algorithm=SHA1', 'digits=6', 'period=30']
+
+
+def _query_int(text):
+    """
+    int(text) for a query value, or None if int() would reject it.
+
+    Allows the surrounding whitespace and sign that int() allows; underscore
+    digit separators are not accepted.
+    """
+    text = text.strip()
+    number = text[1:] if text[:1] in ('+', '-') else text
+    return int(text) if number.isdecimal() else None
+
+
+class _FallbackNeeded(Exception):
+    """Raised by QRParser._parse_fast when a URI needs the generic parser."""
 
 
 class QRParser:
@@ -34,19 +72,39 @@ class QRParser:
         if not uri or not isinstance(uri, str):
             raise ValueError("URI must be a non-empty string")
 
+        return _parse_cached(uri)._asdict()
+
+    @staticmethod
+    def _parse(uri):
+        """Parse a non-empty URI string into a ParsedOTP; see parse_otpauth_uri."""
+        if '\n' in uri or '\r' in uri or '\t' in uri:
+            uri = uri.translate(_URL_STRIP_CHARS)
+
+        if uri.startswith("otpauth://totp/"):
+            try:
+                return QRParser._parse_fast(uri)
+            except _FallbackNeeded:
+                pass
+
         if not uri.startswith("otpauth://"):
             raise ValueError("URI must start with 'otpauth://'")
 
-        # Parse the URI
-        parsed_url = urlparse(uri)
+        # Split "otpauth://TYPE/PATH?QUERY#FRAGMENT" in one pass
+        rest = uri[10:].partition('#')[0]
+        rest, _, query = rest.partition('?')
+        slash = rest.find('/')
+        if slash < 0:
+            netloc, path = rest, ''
+        else:
+            netloc, path = rest[:slash], rest[slash:]
 
         # Extract type (totp or hotp)
-        otp_type = parsed_url.netloc.lower()
+        otp_type = netloc.lower()
         if otp_type not in ['totp', 'hotp']:
             raise ValueError(f"Unsupported OTP type: {otp_type}")
 
         # Extract label and issuer from path
-        path = parsed_url.path.lstrip('/')
+        path = path.lstrip('/')
 
         # Path format: "issuer:label" or just "label"
         if ':' in path:
@@ -59,16 +117,26 @@ class QRParser:
         # URL decode the label
         label = QRParser._url_decode(label)
 
-        # Parse query parameters
-        params = parse_qs(parsed_url.query)
-
-        # Extract parameters (parse_qs returns lists, get first value)
-        secret = QRParser._get_param(params, 'secret')
-        issuer = QRParser._get_param(params, 'issuer') or issuer_from_path or 'Unknown'
-        algorithm = QRParser._get_param(params, 'algorithm', 'SHA1').upper()
-        digits = QRParser._get_param(params, 'digits', '6')
-        period = QRParser._get_param(params, 'period', '30')
-        counter = QRParser._get_param(params, 'counter', '0')
+        # Parse query parameters; every key is single-valued, first one wins
+        params = {}
+        for pair in query.split('&'):
+            key, sep, value = pair.partition('=')
+            if not sep or not value:
+                continue
+            if '%' in key or '+' in key:
+                key = unquote_plus(key)
+            if key in params:
+                continue
+            if '%' in value or '+' in value:
+                value = unquote_plus(value)
+            params[key] = value
+
+        secret = params.get('secret')
+        issuer = params.get('issuer') or issuer_from_path or 'Unknown'
+        algorithm = params.get('algorithm', 'SHA1').upper()
+        digits = params.get('digits', '6')
+        period = params.get('period', '30')
+        counter = params.get('counter', '0')
 
         # Validate required parameters
         if not secret:
@@ -82,64 +150,64 @@ class QRParser:
             raise ValueError(f"Invalid secret format: {secret}")
 
         # Validate algorithm
-        valid_algorithms = ['SHA1', 'SHA256', 'SHA512', 'MD5']
-        if algorithm not in valid_algorithms:
-            raise ValueError(f"Invalid algorithm: {algorithm}. Must be one of: {', '.join(valid_algorithms)}")
+        if algorithm not in _VALID_ALGORITHMS:
+            raise ValueError(f"Invalid algorithm: {algorithm}. Must be one of: {', '.join(_ALGORITHMS)}")
 
-        # Validate digits
-        try:
-            digits_int = int(digits)
-            if digits_int < 4 or digits_int > 10:
-                raise ValueError("Digits must be between 4 and 10")
-        except ValueError:
+        # Validate digits, period (TOTP) and counter (HOTP)
+        digits_int = _query_int(digits)
+        if digits_int is None or not 4 <= digits_int <= 10:
             raise ValueError(f"Invalid digits value: {digits}")
 
-        # Validate period (for TOTP)
-        try:
-            period_int = int(period)
-            if period_int < 1:
-                raise ValueError("Period must be positive")
-        except ValueError:
+        period_int = _query_int(period)
+        if period_int is None or period_int < 1:
             raise ValueError(f"Invalid period value: {period}")
 
-        # Validate counter (for HOTP)
-        try:
-            counter_int = int(counter)
-            if counter_int < 0:
-                raise ValueError("Counter must be non-negative")
-        except ValueError:
+        counter_int = _query_int(counter)
+        if counter_int is None or counter_int < 0:
             raise ValueError(f"Invalid counter value: {counter}")
 
-        # Build result dictionary
-        result = {
-            'type': otp_type,
-            'label': label,
-            'secret': secret.upper(),  # Normalize to uppercase
-            'issuer': issuer,
-            'algorithm': algorithm,
-            'digits': str(digits_int),
-            'period': str(period_int) if otp_type == 'totp' else None,
-            'counter': str(counter_int) if otp_type == 'hotp' else None,
-        }
-
-        return result
+        return ParsedOTP(
+            otp_type,
+            label,
+            secret.upper(),  # Normalize to uppercase
+            issuer,
+            algorithm,
+            str(digits_int),
+            str(period_int) if otp_type == 'totp' else None,
+            str(counter_int) if otp_type == 'hotp' else None,
+        )
 
     @staticmethod
-    def _get_param(params_dict, key, default=None):
+    def _parse_fast(uri):
         """
-        Get parameter value from parsed query parameters.
+        Parse the common canonical URI shape without the generic machinery.
 
-        Args:
-            params_dict (dict): Parsed query parameters (from parse_qs)
-            key (str): Parameter key
-            default: Default value if not found
+        Only handles "otpauth://totp/ISSUER:LABEL?secret=S&issuer=I" followed
+        by the default algorithm, digits and period, with nothing to decode
+        in the query.
 
-        Returns:
-            str: Parameter value or default
+        Raises:
+            _FallbackNeeded: If the URI has any other shape or is invalid
         """
-        if key in params_dict and params_dict[key]:
-            return params_dict[key][0]
-        return default
+        path, sep, query = uri[15:].partition('?')
+        if not sep or '#' in query or '%' in query or '+' in query:
+            raise _FallbackNeeded
+        parts = query.split('&')
+        if len(parts) != 5 or parts[2:] != _DEFAULT_QUERY_TAIL:
+            raise _FallbackNeeded
+        secret_kv, issuer_kv = parts[0], parts[1]
+        if not secret_kv.startswith('secret=') or not issuer_kv.startswith('issuer='):
+            raise _FallbackNeeded
+        secret, issuer = secret_kv[7:], issuer_kv[7:]
+
+        _, colon, label = path.partition(':')
+        if not colon or '#' in path or path.startswith('/'):
+            raise _FallbackNeeded
+        label = QRParser._url_decode(label)
+        if not label or not issuer or not QRParser._is_valid_base32(secret):
+            raise _FallbackNeeded
+
+        return ParsedOTP('totp', label, secret.upper(), issuer, 'SHA1', '6', '30', None)
 
     @staticmethod
     def _url_decode(text):
@@ -169,9 +237,12 @@ class QRParser:
         if not value:
             return False
 
-        # Base32 alphabet: A-Z, 2-7, and optional padding (=)
-        pattern = r'^[A-Z2-7]+=*$'
-        return bool(re.match(pattern, value.upper()))
+        # Base32 alphabet: A-Z, 2-7, and optional trailing padding (=)
+        try:
+            data = value.encode('ascii').rstrip(b'=')
+        except UnicodeEncodeError:
+            return False
+        return bool(data) and b'\x01' not in data.translate(_B32_TRANS)
 
     @staticmethod
     def build_otpauth_uri(profile_data):
@@ -248,6 +319,17 @@ class QRParser:
             return False, str(err)
 
 
+@functools.lru_cache(maxsize=128)
+def _parse_cached(uri):
+    """
+    Memoized QRParser._parse, keyed by the raw URI string.
+
+    The clipboard poll hands the same text over repeatedly; results are kept
+    as immutable ParsedOTP tuples and copied into a fresh dict per caller.
+    """
+    return QRParser._parse(uri)
+
+
 def parse_otpauth_uri(uri):
     """
     Convenience function - parses otpauth:// URI.
@@ -261,6 +343,11 @@ def parse_otpauth_uri(uri):
     return QRParser.parse_otpauth_uri(uri)
 
 
+def clear_parse_cache():
+    """Drop memoized parse results, which hold secrets (on session lock)."""
+    _parse_cached.cache_clear()
+
+
 def build_otpauth_uri(profile_data):
     """
     Convenience function - builds otpauth:// URI.
@@ -1,11 +1,9 @@
 """
 QR code operations service.
 """
-import qrcode
-from PIL import Image
 from io import BytesIO
-from pyzbar.pyzbar import decode
-from PyQt5.QtGui import QPixmap
+from collections import OrderedDict
+from PyQt5.QtGui import QImage, QPixmap
 from config import QR_PREVIEW_SIZE
 from core.totp_crypto import encrypt_bytes, decrypt_bytes
 
@@ -13,8 +11,19 @@ from core.totp_crypto import encrypt_bytes, decrypt_bytes
 class QRService:
     """Handles QR code operations."""
     
+    PIXMAP_CACHE_SIZE = 32
+    
+    def __init__(self):
+        # uri -> QPixmap, least recently used first
+        self._pix_cache = OrderedDict()
+    
     def decode_qr_file(self, fname, master_pw):
         """Decode QR code from file."""
+        # Imaging libraries are imported on first use to keep them (and
+        # pyzbar's native library) off the startup path
+        from PIL import Image
+        from pyzbar.pyzbar import decode
+        
         if fname.lower().endswith(".enc"):
             with open(fname, "rb") as f:
                 encrypted_bytes = f.read()
@@ -30,21 +39,39 @@ class QRService:
         return result[0].data.decode()
     
     def generate_qr_pixmap(self, uri):
-        """Generate QR code as pixmap."""
-        qr = qrcode.make(uri).resize(QR_PREVIEW_SIZE)
-        buffer = BytesIO()
-        qr.save(buffer, format="PNG")
-        pixmap = QPixmap()
-        pixmap.loadFromData(buffer.getvalue())
+        """Generate QR code as pixmap, reusing recently generated ones."""
+        pixmap = self._pix_cache.get(uri)
+        if pixmap is not None:
+            self._pix_cache.move_to_end(uri)
+            return pixmap
+        
+        import qrcode
+        
+        # Hand the raw 8-bit pixels straight to Qt instead of a PNG round-trip
+        qr = qrcode.make(uri).resize(QR_PREVIEW_SIZE).convert("L")
+        data = qr.tobytes()
+        image = QImage(data, qr.width, qr.height, qr.width, QImage.Format_Grayscale8)
+        pixmap = QPixmap.fromImage(image)
+        
+        self._pix_cache[uri] = pixmap
+        if len(self._pix_cache) > self.PIXMAP_CACHE_SIZE:
+            self._pix_cache.popitem(last=False)
         return pixmap
     
+    def clear_cache(self):
+        """Drop cached QR pixmaps."""
+        self._pix_cache.clear()
+    
     def save_qr_encrypted(self, uri, save_path, master_pw):
         """Save QR code encrypted."""
+        import qrcode
+        
+        # qrcode already renders 1-bit images, so the PNG stays small; encrypt
+        # straight from the buffer instead of copying it out first
         img = qrcode.make(uri).resize((200, 200))
         buf = BytesIO()
         img.save(buf, format="PNG")
-        raw_bytes = buf.getvalue()
-        encrypted = encrypt_bytes(raw_bytes, master_pw)
+        encrypted = encrypt_bytes(buf.getbuffer(), master_pw)
         
         with open(save_path, "wb") as f:
             f.write(encrypted)
\ No newline at end of file
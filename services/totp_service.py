@@ -2,21 +2,154 @@
 TOTP generation service.
 """
 import time
-import pyotp
+import base64
+import struct
+from core.totp_crypto import HASH_ALGORITHMS
+
+# XOR tables for the HMAC inner/outer key pads (RFC 2104)
+_IPAD = bytes(x ^ 0x36 for x in range(256))
+_OPAD = bytes(x ^ 0x5C for x in range(256))
 
 
 class TOTPService:
     """Handles TOTP generation."""
     
-    def generate_totp(self, data):
-        """Generate TOTP code and remaining time."""
-        totp = pyotp.TOTP(
-            data['secret'],
-            digits=int(data.get('digits', 6)),
-            interval=int(data.get('period', 30)),
-            digest=data.get('algorithm', 'SHA1').lower()
-        )
-        interval = totp.interval
-        remaining = interval - int(time.time()) % interval
-        code = totp.now()
-        return code, remaining
\ No newline at end of file
+    def __init__(self):
+        # (secret, digits, period, algorithm) -> decoded parameters, shared by
+        # every profile dict with the same settings (e.g. after a reload).
+        # Kept here only: profile dicts belong to the caller and get saved.
+        self._cache = {}
+        # decoded parameters -> (counter, code) of the last time step computed
+        self._last_codes = {}
+    
+    def generate_totp(self, data, now_ns=None):
+        """
+        Generate TOTP code and remaining time.
+
+        Pass ``now_ns`` (a time.time_ns() value) to share one timestamp
+        across several calls. No HMAC is computed while the time step has
+        not changed.
+        """
+        if now_ns is None:
+            now_ns = time.time_ns()
+        params = self._batch_params(data)
+        interval = params[3]
+        counter, elapsed = divmod(now_ns // 1_000_000_000, interval)
+        return self._code_at(params, counter), interval - elapsed
+    
+    def prepare(self, data):
+        """
+        Decode a profile's secret ahead of its first code.
+
+        Meant for the profile loading path, so the refresh timer never has
+        to base32-decode or set up HMAC state.
+
+        Returns:
+            bool: False if the profile has invalid parameters
+        """
+        try:
+            self._batch_params(data)
+        except Exception:
+            return False
+        return True
+    
+    def discard(self, data):
+        """Drop the decoded secret and remembered code of one profile."""
+        params = self._cache.pop(self._cache_key(data), None)
+        if params is not None:
+            self._last_codes.pop(params, None)
+    
+    def clear(self):
+        """Drop decoded secrets and remembered codes (lock, reset)."""
+        self._cache.clear()
+        self._last_codes.clear()
+    
+    @staticmethod
+    def _cache_key(data):
+        """Settings that determine a profile's decoded parameters."""
+        return (data['secret'], data.get('digits', 6), data.get('period', 30), data.get('algorithm', 'SHA1'))
+    
+    def _batch_params(self, data):
+        """
+        Decode profile parameters once per distinct setting.
+
+        The HMAC key is absorbed into hash states for the inner and outer pad
+        up front, so each code only costs two short hash updates.
+
+        Returns:
+            tuple: (inner hash, outer hash, digits, interval)
+        """
+        cache_key = self._cache_key(data)
+        params = self._cache.get(cache_key)
+        if params is None:
+            secret = data['secret'].upper()
+            key = base64.b32decode(secret + '=' * (-len(secret) % 8))
+            algorithm = data.get('algorithm', 'SHA1')
+            digest = HASH_ALGORITHMS.get(algorithm.lower())
+            if digest is None:
+                raise ValueError(f"Unsupported algorithm: {algorithm}")
+            block_size = digest().block_size
+            if len(key) > block_size:
+                key = digest(key).digest()
+            key = key.ljust(block_size, b'\0')
+            inner = digest(key.translate(_IPAD))
+            outer = digest(key.translate(_OPAD))
+            params = self._cache[cache_key] = (inner, outer, int(data.get('digits', 6)), int(data.get('period', 30)))
+        return params
+    
+    def _code_at(self, params, counter):
+        """Return the code for a time step, reusing the last one if unchanged."""
+        last = self._last_codes.get(params)
+        if last is not None and last[0] == counter:
+            return last[1]
+        inner, outer, digits, _ = params
+        code = self._code(inner, outer, struct.pack(">Q", counter), digits)
+        self._last_codes[params] = (counter, code)
+        return code
+    
+    @staticmethod
+    def _code(inner, outer, msg, digits):
+        """RFC 4226 HMAC and dynamic truncation for one packed counter."""
+        ih = inner.copy()
+        ih.update(msg)
+        oh = outer.copy()
+        oh.update(ih.digest())
+        h = oh.digest()
+        o = h[-1] & 0x0F
+        code = ((h[o] & 0x7F) << 24 | h[o + 1] << 16 | h[o + 2] << 8 | h[o + 3]) % 10 ** digits
+        return f"{code:0{digits}d}"
+    
+    def generate_batch(self, profiles, now_ns=None):
+        """
+        Generate codes for many profiles at once.
+
+        The counter is computed once per distinct period, and a profile only
+        gets a new HMAC when its time step has rolled over.
+
+        Args:
+            profiles (dict): Profile name -> profile data
+            now_ns (int): time.time_ns() timestamp to generate for
+                (default: current time)
+
+        Returns:
+            dict: Profile name -> (counter, interval, code); profiles with
+                invalid parameters are left out
+        """
+        if now_ns is None:
+            now_ns = time.time_ns()
+        now = now_ns // 1_000_000_000
+        
+        counters = {}
+        results = {}
+        for name, data in profiles.items():
+            try:
+                params = self._batch_params(data)
+            except Exception:
+                continue
+            
+            interval = params[3]
+            counter = counters.get(interval)
+            if counter is None:
+                counter = counters[interval] = now // interval
+            results[name] = (counter, interval, self._code_at(params, counter))
+        return results
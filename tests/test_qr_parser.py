@@ -0,0 +1,53 @@
+"""
+Tests for otpauth:// URI parsing.
+"""
+import unittest
+
+from services.qr_parser import parse_otpauth_uri, clear_parse_cache
+
+
+class ParseOtpauthUriTest(unittest.TestCase):
+    """parse_otpauth_uri on pasted and hand-written URIs."""
+
+    def setUp(self):
+        clear_parse_cache()
+
+    def test_trailing_newline_after_secret(self):
+        parsed = parse_otpauth_uri("otpauth://totp/A:alice?secret=JBSWY3DPEHPK3PXP\n")
+        self.assertEqual(parsed['secret'], "JBSWY3DPEHPK3PXP")
+        self.assertEqual(parsed['label'], "alice")
+
+    def test_trailing_crlf_after_period(self):
+        parsed = parse_otpauth_uri("otpauth://totp/A:alice?secret=JBSWY3DPEHPK3PXP&period=30\r\n")
+        self.assertEqual(parsed['period'], "30")
+
+    def test_trailing_newline_not_kept_in_issuer(self):
+        parsed = parse_otpauth_uri("otpauth://totp/A:alice?secret=JBSWY3DPEHPK3PXP&issuer=Acme\n")
+        self.assertEqual(parsed['issuer'], "Acme")
+
+    def test_canonical_uri(self):
+        parsed = parse_otpauth_uri(
+            "otpauth://totp/Acme:alice?secret=JBSWY3DPEHPK3PXP&issuer=Acme"
+            "&algorithm=SHA1&digits=6&period=30\n"
+        )
+        self.assertEqual((parsed['issuer'], parsed['label'], parsed['digits']), ("Acme", "alice", "6"))
+
+    def test_numeric_values_accepted_like_int(self):
+        base = "otpauth://totp/A:alice?secret=JBSWY3DPEHPK3PXP"
+        self.assertEqual(parse_otpauth_uri(base + "&digits=+6")['digits'], "6")
+        self.assertEqual(parse_otpauth_uri(base + "&digits=%2B8")['digits'], "8")
+        self.assertEqual(parse_otpauth_uri(base + "&period=30%20")['period'], "30")
+        hotp = "otpauth://hotp/A:alice?secret=JBSWY3DPEHPK3PXP"
+        self.assertEqual(parse_otpauth_uri(hotp + "&counter=-0")['counter'], "0")
+
+    def test_numeric_values_rejected(self):
+        base = "otpauth://totp/A:alice?secret=JBSWY3DPEHPK3PXP"
+        for query in ("&digits=6.0", "&digits=3", "&period=0", "&digits=1_0"):
+            with self.assertRaises(ValueError):
+                parse_otpauth_uri(base + query)
+        with self.assertRaises(ValueError):
+            parse_otpauth_uri("otpauth://hotp/A:alice?secret=JBSWY3DPEHPK3PXP&counter=-1")
+
+
+if __name__ == '__main__':
+    unittest.main()
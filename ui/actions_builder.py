@@ -5,6 +5,23 @@ from PyQt5.QtWidgets import QAction, QToolBar, QMessageBox
 from PyQt5.QtGui import QKeySequence
 from PyQt5.QtCore import QSize
 
+# (key, text, shortcut, status tip, target, slot); target is 'core', 'window'
+# (the main window) or 'builder' (this ActionsBuilder)
+_ACTION_SPECS = (
+    ('upload', "📤 Upload QR Code", "Ctrl+O", "Upload a QR code image", 'core', 'upload_qr'),
+    ('save_qr', "💾 Save QR Code", "Ctrl+S", "Save current QR code", 'core', 'save_qr'),
+    ('exit', "🚪 Exit", "Ctrl+Q", "Exit application", 'window', 'close'),
+    ('refresh', "🔄 Refresh List", "F5", "Refresh profile list", 'core', 'load_profiles'),
+    ('delete', "🗑️ Delete Profile", "Delete", "Delete selected profile", 'core', 'delete_profile'),
+    ('change_pw', "🔐 Change Master Password", None, "Change master password", 'core', 'change_master_password'),
+    ('reset_key', "🔑 Reset Master Key", None, "Reset master encryption key", 'core', 'reset_master_key'),
+    ('reset_vault', "Reset Vault (Delete All Profiles)", None, None, 'core', 'reset_vault'),
+    ('lock', "🔒 Lock Application", "Ctrl+L", "Lock the application", 'core', 'lock_application'),
+    ('about', "ℹ️ About", None, "About this application", 'builder', 'show_about'),
+    ('help', "❓ Help", "F1", "Show help documentation", 'builder', 'show_help'),
+    ('manual_totp', "Generate TOTP", None, "Generate a TOTP code manually", 'core', 'manual_totp_prompt'),
+)
+
 class ActionsBuilder:
     """Creates and manages application actions."""
     
@@ -14,60 +31,16 @@ class ActionsBuilder:
         self.actions = {}
     
     def create_actions(self):
-        """Create all actions."""
-        self.actions['upload'] = QAction("📤 Upload QR Code", self.main_window)
-        self.actions['upload'].setShortcut(QKeySequence("Ctrl+O"))
-        self.actions['upload'].setStatusTip("Upload a QR code image")
-        self.actions['upload'].triggered.connect(self.core.upload_qr)
-        
-        self.actions['save_qr'] = QAction("💾 Save QR Code", self.main_window)
-        self.actions['save_qr'].setShortcut(QKeySequence("Ctrl+S"))
-        self.actions['save_qr'].setStatusTip("Save current QR code")
-        self.actions['save_qr'].triggered.connect(self.core.save_qr)
-        
-        self.actions['exit'] = QAction("🚪 Exit", self.main_window)
-        self.actions['exit'].setShortcut(QKeySequence("Ctrl+Q"))
-        self.actions['exit'].setStatusTip("Exit application")
-        self.actions['exit'].triggered.connect(self.main_window.close)
-        
-        self.actions['refresh'] = QAction("🔄 Refresh List", self.main_window)
-        self.actions['refresh'].setShortcut(QKeySequence("F5"))
-        self.actions['refresh'].setStatusTip("Refresh profile list")
-        self.actions['refresh'].triggered.connect(self.core.load_profiles)
-        
-        self.actions['delete'] = QAction("🗑️ Delete Profile", self.main_window)
-        self.actions['delete'].setShortcut(QKeySequence("Delete"))
-        self.actions['delete'].setStatusTip("Delete selected profile")
-        self.actions['delete'].triggered.connect(self.core.delete_profile)
-        
-        self.actions['change_pw'] = QAction("🔐 Change Master Password", self.main_window)
-        self.actions['change_pw'].setStatusTip("Change master password")
-        self.actions['change_pw'].triggered.connect(self.core.change_master_password)
-        
-        self.actions['reset_key'] = QAction("🔑 Reset Master Key", self.main_window)
-        self.actions['reset_key'].setStatusTip("Reset master encryption key")
-        self.actions['reset_key'].triggered.connect(self.core.reset_master_key)
-        
-        self.actions['reset_vault'] = QAction("Reset Vault (Delete All Profiles)", self.main_window)
-        self.actions['reset_vault'].triggered.connect(self.core.reset_vault)
-        
-        self.actions['lock'] = QAction("🔒 Lock Application", self.main_window)
-        self.actions['lock'].setShortcut(QKeySequence("Ctrl+L"))
-        self.actions['lock'].setStatusTip("Lock the application")
-        self.actions['lock'].triggered.connect(self.core.lock_application)
-        
-        self.actions['about'] = QAction("ℹ️ About", self.main_window)
-        self.actions['about'].setStatusTip("About this application")
-        self.actions['about'].triggered.connect(self.show_about)
-        
-        self.actions['help'] = QAction("❓ Help", self.main_window)
-        self.actions['help'].setShortcut(QKeySequence("F1"))
-        self.actions['help'].setStatusTip("Show help documentation")
-        self.actions['help'].triggered.connect(self.show_help)
-        
-        self.actions['manual_totp'] = QAction("Generate TOTP", self.main_window)
-        self.actions['manual_totp'].setStatusTip("Generate a TOTP code manually")
-        self.actions['manual_totp'].triggered.connect(self.core.manual_totp_prompt)
+        """Create all actions from _ACTION_SPECS."""
+        targets = {'core': self.core, 'window': self.main_window, 'builder': self}
+        for key, text, shortcut, tip, target, slot in _ACTION_SPECS:
+            action = QAction(text, self.main_window)
+            if shortcut:
+                action.setShortcut(QKeySequence(shortcut))
+            if tip:
+                action.setStatusTip(tip)
+            action.triggered.connect(getattr(targets[target], slot))
+            self.actions[key] = action
     
     def create_menu_bar(self):
         """Create menu bar."""
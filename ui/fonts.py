@@ -0,0 +1,17 @@
+"""
+Shared fonts for the main window and dialogs.
+"""
+import functools
+
+from PyQt5.QtGui import QFont
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(family, point_size, weight=-1):
+    """
+    Font matched once per (family, size, weight).
+
+    Built on first use rather than at import, since fonts need a running
+    QApplication; QFont is implicitly shared, so widgets can reuse one.
+    """
+    return QFont(family, point_size, weight)
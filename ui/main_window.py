@@ -1,17 +1,39 @@
 """
 Main window implementation for TokenX TOTP Manager.
 """
-from PyQt5.QtWidgets import QMainWindow
-from PyQt5.QtCore import QTimer, QEvent
+from PyQt5.QtWidgets import QMainWindow, QApplication
+from PyQt5.QtCore import Qt, QTimer, QEvent, QObject
 import time
 
-from config import APP_NAME, ICON_PATH, WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT
+from config import (
+    APP_NAME, ICON_PATH, WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT,
+    TOTP_REFRESH_INTERVAL_MS, TOTP_FULL_REFRESH_MS
+)
 from ui.ui_builder import UIBuilder
 from core.manager import TOTPManagerCore
 from services.auth_service import AuthService
 from PyQt5.QtGui import QIcon
 
 
+# User input that counts as activity for the idle lock
+_ACTIVITY_EVENTS = frozenset((QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.MouseMove, QEvent.Wheel))
+
+
+class _ActivityFilter(QObject):
+    """Application-wide event filter recording the time of the last user input."""
+    
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+    
+    def eventFilter(self, obj, event):
+        # Runs for every event in the app: one set lookup, nothing else for
+        # paints, timers and layouts
+        if event.type() in _ACTIVITY_EVENTS:
+            self.window.last_activity_time = time.monotonic()
+        return False
+
+
 class TOTPManager(QMainWindow):
     """Main application window."""
     
@@ -21,8 +43,13 @@ class TOTPManager(QMainWindow):
         self.setWindowIcon(QIcon(ICON_PATH))
         self.setMinimumSize(WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT)
         
-        # Core attributes
-        self.last_activity_time = time.time()
+        # Core attributes; activity is tracked on the monotonic clock
+        self.last_activity_time = time.monotonic()
+        
+        # Input in dialogs (unlock prompt, TOTP generator, message boxes)
+        # counts too, so activity is watched application-wide
+        self._activity_filter = _ActivityFilter(self)
+        QApplication.instance().installEventFilter(self._activity_filter)
         
         # Initialize services
         self.auth_service = AuthService()
@@ -31,6 +58,7 @@ class TOTPManager(QMainWindow):
         # UI Builder
         self.ui_builder = None
         self.totp_timer:QTimer | None = None
+        self.totp_full_timer:QTimer | None = None
         self.idle_timer:QTimer | None = None
         self.clipboard_timer:QTimer | None = None
         
@@ -50,10 +78,21 @@ class TOTPManager(QMainWindow):
     
     def setup_timers(self):
         """Initialize all timers."""
+        # Countdown only; codes are regenerated by the full refresh timer.
+        # Single-shot, re-armed on every tick for the next second boundary.
         self.totp_timer = QTimer()
+        self.totp_timer.setSingleShot(True)
+        self.totp_timer.setTimerType(Qt.PreciseTimer)
         #noinspection PyUnresolvedReferences
-        self.totp_timer.timeout.connect(self.on_refresh_totps)
-        self.totp_timer.start(1000)
+        self.totp_timer.timeout.connect(self.on_update_remaining)
+        self.schedule_countdown()
+        
+        # Full refresh, aligned to the wall-clock period boundary
+        self.totp_full_timer = QTimer()
+        # noinspection PyUnresolvedReferences
+        self.totp_full_timer.timeout.connect(self.on_refresh_totps)
+        ms_to_boundary = TOTP_FULL_REFRESH_MS - int(time.time() * 1000) % TOTP_FULL_REFRESH_MS
+        QTimer.singleShot(ms_to_boundary, self.start_full_refresh)
         
         self.idle_timer = QTimer()
         # noinspection PyUnresolvedReferences
@@ -76,15 +115,32 @@ class TOTPManager(QMainWindow):
         self.core = TOTPManagerCore(
             self.auth_service.master_pw,
             self.auth_service.master_key,
-            self.ui_builder
+            self.ui_builder,
+            self.auth_service.encrypted_master
         )
         self.core.load_profiles()
     
+    def schedule_countdown(self):
+        """Arm the countdown timer for the next refresh boundary."""
+        ms_to_tick = TOTP_REFRESH_INTERVAL_MS - int(time.time() * 1000) % TOTP_REFRESH_INTERVAL_MS
+        self.totp_timer.start(max(1, ms_to_tick))
+    
+    def start_full_refresh(self):
+        """Refresh TOTP codes and start the periodic full refresh."""
+        self.on_refresh_totps()
+        self.totp_full_timer.start(TOTP_FULL_REFRESH_MS)
+    
     def on_refresh_totps(self):
         """Refresh TOTP codes."""
         if self.core:
             self.core.refresh_totps()
     
+    def on_update_remaining(self):
+        """Update TOTP countdowns."""
+        if self.core:
+            self.core.update_remaining_only()
+        self.schedule_countdown()
+    
     def on_check_idle(self):
         """Check idle timeout."""
         if self.core:
@@ -93,10 +149,4 @@ class TOTPManager(QMainWindow):
     def on_check_clipboard(self):
         """Check clipboard for OTP URI."""
         if self.core:
-            self.core.check_clipboard()
-    
-    def event(self, event):
-        """Handle events for activity tracking."""
-        if event.type() in (QEvent.MouseMove, QEvent.KeyPress):
-            self.last_activity_time = time.time()
-        return super().event(event)
\ No newline at end of file
+            self.core.check_clipboard()
\ No newline at end of file
@@ -5,10 +5,84 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QProgressBar, QMessageBox, QCheckBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
-import re
 from config import ICON_PATH
+from ui.fonts import get_font
+
+# Byte classes for PasswordStrengthMeter: one translate() maps every byte of
+# the UTF-8 encoded password to its class, then each check is a memchr
+_LOWER, _UPPER, _DIGIT, _SPECIAL = 1, 2, 3, 4
+_SPECIAL_CHARS = b"""!@#$%^&*()_+-=[]{};:'",.<>?/\\|`~"""
+
+
+def _byte_class(c):
+    if 0x61 <= c <= 0x7A:
+        return _LOWER
+    if 0x41 <= c <= 0x5A:
+        return _UPPER
+    if 0x30 <= c <= 0x39:
+        return _DIGIT
+    if c in _SPECIAL_CHARS:
+        return _SPECIAL
+    return 0
+
+
+_CLASS_TABLE = bytes.maketrans(bytes(range(256)), bytes(_byte_class(c) for c in range(256)))
+_VARIETY_CLASSES = frozenset((_LOWER, _UPPER, _DIGIT, _SPECIAL))
+
+# Bits for the checks a password can fail; feedback is looked up per bitmask
+_FAIL_SHORT, _FAIL_LOWER, _FAIL_UPPER, _FAIL_DIGIT = 1, 2, 4, 8
+_FAIL_SPECIAL, _FAIL_REPEAT, _FAIL_SEQUENCE = 16, 32, 64
+_VARIETY_FAILURES = (
+    (_LOWER, _FAIL_LOWER), (_UPPER, _FAIL_UPPER), (_DIGIT, _FAIL_DIGIT), (_SPECIAL, _FAIL_SPECIAL)
+)
+_FEEDBACK_MESSAGES = (
+    (_FAIL_LOWER, "Add lowercase letters (a-z)"),
+    (_FAIL_UPPER, "Add uppercase letters (A-Z)"),
+    (_FAIL_DIGIT, "Add numbers (0-9)"),
+    (_FAIL_SPECIAL, "Add special characters (!@#$%^&*)"),
+    (_FAIL_REPEAT, "Avoid repeating characters"),
+    (_FAIL_SEQUENCE, "Avoid sequential characters"),
+)
+
+# Strength level -> value of the "strength" property the stylesheets select on
+_STRENGTH_KEYS = {
+    "Very Weak": "very_weak", "Weak": "weak", "Fair": "fair", "Good": "good", "Strong": "strong"
+}
+_STRENGTH_COLORS = (
+    ("very_weak", "#ff0000"), ("weak", "#ff6600"), ("fair", "#ffcc00"),
+    ("good", "#99cc00"), ("strong", "#00cc00")
+)
+
+# Installed once per dialog; a strength change only flips the property
+_STRENGTH_BAR_STYLE = """
+    QProgressBar {
+        border: 2px solid #ccc;
+        border-radius: 5px;
+        background-color: #f0f0f0;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        border-radius: 3px;
+    }
+""" + "".join(
+    f'QProgressBar[strength="{key}"]::chunk {{ background-color: {color}; }}\n'
+    for key, color in _STRENGTH_COLORS
+)
+_STRENGTH_LABEL_STYLE = "".join(
+    f'QLabel[strength="{key}"] {{ color: {color}; }}\n' for key, color in _STRENGTH_COLORS
+)
+
+# Match indicator colors, keyed by outcome
+_MATCH_STYLES = {
+    "mismatch": "color: #ff0000;",
+    "warning": "color: #ff6600;",
+    "ok": "color: #00cc00;",
+}
+
+# Sequential runs to avoid, matched case-insensitively
+_SEQUENCES = frozenset(('012', '123', '234', '345', '456', '567', '678', '789', 'abc', 'bcd', 'cde'))
 
 
 class PasswordStrengthMeter:
@@ -25,17 +99,23 @@ class PasswordStrengthMeter:
         Returns:
             tuple: (strength_score, strength_level, feedback_messages, color)
         """
+        score, level, feedback, color = PasswordStrengthMeter._evaluate(password)
+        return score, level, list(feedback), color
+
+    @staticmethod
+    def _evaluate(password):
+        """Score a password; see calculate_strength. Feedback is a tuple."""
         if not password:
-            return 0, "Very Weak", ["Password is empty"], "#ff0000"
+            return 0, "Very Weak", ("Password is empty",), "#ff0000"
 
         score = 0
-        feedback = []
+        failed = 0
 
         # Length checks
         if len(password) >= 8:
             score += 10
         else:
-            feedback.append(f"Password should be at least 8 characters (currently {len(password)})")
+            failed |= _FAIL_SHORT
 
         if len(password) >= 12:
             score += 10
@@ -43,40 +123,26 @@ class PasswordStrengthMeter:
         if len(password) >= 16:
             score += 10
 
-        # Character variety checks
-        has_lower = bool(re.search(r'[a-z]', password))
-        has_upper = bool(re.search(r'[A-Z]', password))
-        has_digit = bool(re.search(r'\d', password))
-        has_special = bool(re.search(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>?/\\|`~]', password))
-
-        if has_lower:
-            score += 15
-        else:
-            feedback.append("Add lowercase letters (a-z)")
-
-        if has_upper:
-            score += 15
-        else:
-            feedback.append("Add uppercase letters (A-Z)")
-
-        if has_digit:
-            score += 15
-        else:
-            feedback.append("Add numbers (0-9)")
-
-        if has_special:
-            score += 15
-        else:
-            feedback.append("Add special characters (!@#$%^&*)")
+        # Character variety checks: 15 points per class present
+        classes = set(password.encode('utf-8', 'surrogatepass').translate(_CLASS_TABLE)) & _VARIETY_CLASSES
+        if _DIGIT not in classes and not password.isascii() and any(ch.isdecimal() for ch in password):
+            # Non-ASCII decimal digits (e.g. Arabic-Indic) count as digits too
+            classes.add(_DIGIT)
+        score += 15 * len(classes)
+        if len(classes) < len(_VARIETY_CLASSES):
+            for cls, bit in _VARIETY_FAILURES:
+                if cls not in classes:
+                    failed |= bit
 
         # Common patterns to avoid
-        if re.search(r'(.)\1{2,}', password):  # Repeating characters
+        # Three identical characters in a row; newlines are not counted
+        if any(a == b == c != '\n' for a, b, c in zip(password, password[1:], password[2:])):
             score -= 10
-            feedback.append("Avoid repeating characters")
+            failed |= _FAIL_REPEAT
 
-        if re.search(r'(012|123|234|345|456|567|678|789|abc|bcd|cde)', password.lower()):
+        if any(password[i:i + 3].lower() in _SEQUENCES for i in range(len(password) - 2)):
             score -= 5
-            feedback.append("Avoid sequential characters")
+            failed |= _FAIL_SEQUENCE
 
         # Ensure score is between 0-100
         score = max(0, min(100, score))
@@ -98,9 +164,27 @@ class PasswordStrengthMeter:
             level = "Strong"
             color = "#00cc00"
 
+        # Only the "too short" message depends on the length
+        feedback = _feedback_for(failed, len(password) if failed & _FAIL_SHORT else 0)
         return score, level, feedback, color
 
 
+def _feedback_for(failed, length):
+    """Feedback messages, in display order, for a bitmask of failed checks."""
+    messages = []
+    if failed & _FAIL_SHORT:
+        messages.append(f"Password should be at least 8 characters (currently {length})")
+    messages.extend(msg for bit, msg in _FEEDBACK_MESSAGES if failed & bit)
+    return tuple(messages)
+
+
+def _feedback_text(feedback):
+    """Render feedback messages as the bulleted text of the feedback label."""
+    if not feedback:
+        return "✓ Password meets all requirements!"
+    return "\n".join(f"• {msg}" for msg in feedback)
+
+
 class PasswordDialog(QDialog):
     """
     Advanced password setup/change dialog with strength meter.
@@ -108,6 +192,8 @@ class PasswordDialog(QDialog):
 
     password_set = pyqtSignal(str)  # Emitted when password is confirmed
 
+    UPDATE_DELAY_MS = 80  # Coalesce keystroke bursts into one strength update
+
     def __init__(self, parent=None, mode="setup", min_length=8):
         """
         Initialize password dialog.
@@ -131,8 +217,19 @@ class PasswordDialog(QDialog):
         self.confirm_button:QPushButton | None = None
         self.confirm_input:QLineEdit | None = None
         self.match_label:QLabel | None = None
+        self._match_style = None
 
-
+        # Debounce timers for the strength meter and the match indicator
+        self._strength_timer = QTimer(self)
+        self._strength_timer.setSingleShot(True)
+        self._strength_timer.setInterval(self.UPDATE_DELAY_MS)
+        # noinspection PyUnresolvedReferences
+        self._strength_timer.timeout.connect(self._update_strength)
+        self._match_timer = QTimer(self)
+        self._match_timer.setSingleShot(True)
+        self._match_timer.setInterval(self.UPDATE_DELAY_MS)
+        # noinspection PyUnresolvedReferences
+        self._match_timer.timeout.connect(self._update_match)
 
         self.setWindowTitle("Master Password Setup" if mode == "setup" else "Change Master Password")
         self.setWindowIcon(QIcon(ICON_PATH))
@@ -150,7 +247,7 @@ class PasswordDialog(QDialog):
 
         # Title
         title_label = QLabel("Create a Strong Master Password")
-        title_font = QFont("Segoe UI", 12, QFont.Bold)
+        title_font = get_font("Segoe UI", 12, QFont.Bold)
         title_label.setFont(title_font)
         main_layout.addWidget(title_label)
 
@@ -162,20 +259,20 @@ class PasswordDialog(QDialog):
             "• Numbers and special characters\n"
             "• No simple patterns"
         )
-        instructions.setFont(QFont("Segoe UI", 9))
+        instructions.setFont(get_font("Segoe UI", 9))
         instructions.setStyleSheet("color: #666; margin-bottom: 10px;")
         main_layout.addWidget(instructions)
 
         # --- Password Input Section ---
         password_label = QLabel("Master Password:")
-        password_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        password_label.setFont(get_font("Segoe UI", 10, QFont.Bold))
         main_layout.addWidget(password_label)
 
         self.password_input = QLineEdit()
         self.password_input.setEchoMode(QLineEdit.Password)
         self.password_input.setPlaceholderText("Enter a strong password...")
         self.password_input.setMinimumHeight(40)
-        self.password_input.setFont(QFont("Segoe UI", 10))
+        self.password_input.setFont(get_font("Segoe UI", 10))
         #noinspection PyUnresolvedReferences
         self.password_input.textChanged.connect(self.on_password_changed)
         main_layout.addWidget(self.password_input)
@@ -188,7 +285,7 @@ class PasswordDialog(QDialog):
 
         # Strength Meter
         strength_label = QLabel("Password Strength:")
-        strength_label.setFont(QFont("Segoe UI", 9, QFont.Bold))
+        strength_label.setFont(get_font("Segoe UI", 9, QFont.Bold))
         main_layout.addWidget(strength_label)
 
         self.strength_bar = QProgressBar()
@@ -196,32 +293,23 @@ class PasswordDialog(QDialog):
         self.strength_bar.setMaximum(100)
         self.strength_bar.setValue(0)
         self.strength_bar.setMinimumHeight(25)  # Use setMinimumHeight instead of setHeight
-        self.strength_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #ccc;
-                border-radius: 5px;
-                background-color: #f0f0f0;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background-color: #ff0000;
-                border-radius: 3px;
-            }
-        """)
+        self.strength_bar.setProperty("strength", "very_weak")
+        self.strength_bar.setStyleSheet(_STRENGTH_BAR_STYLE)
         main_layout.addWidget(self.strength_bar)
 
         # Strength feedback
         strength_feedback_layout = QHBoxLayout()
         self.strength_level_label = QLabel("Very Weak")
-        self.strength_level_label.setFont(QFont("Segoe UI", 9, QFont.Bold))
-        self.strength_level_label.setStyleSheet("color: #ff0000;")
+        self.strength_level_label.setFont(get_font("Segoe UI", 9, QFont.Bold))
+        self.strength_level_label.setProperty("strength", "very_weak")
+        self.strength_level_label.setStyleSheet(_STRENGTH_LABEL_STYLE)
         strength_feedback_layout.addWidget(self.strength_level_label)
         strength_feedback_layout.addStretch()
         main_layout.addLayout(strength_feedback_layout)
 
         # Feedback text
         self.feedback_label = QLabel("")
-        self.feedback_label.setFont(QFont("Segoe UI", 8))
+        self.feedback_label.setFont(get_font("Segoe UI", 8))
         self.feedback_label.setStyleSheet("color: #666; margin-top: -5px;")
         self.feedback_label.setWordWrap(True)
         self.feedback_label.setMinimumHeight(50)
@@ -229,14 +317,14 @@ class PasswordDialog(QDialog):
 
         # --- Confirm Password Section ---
         confirm_label = QLabel("Confirm Password:")
-        confirm_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        confirm_label.setFont(get_font("Segoe UI", 10, QFont.Bold))
         main_layout.addWidget(confirm_label)
 
         self.confirm_input = QLineEdit()
         self.confirm_input.setEchoMode(QLineEdit.Password)
         self.confirm_input.setPlaceholderText("Re-enter your password...")
         self.confirm_input.setMinimumHeight(40)
-        self.confirm_input.setFont(QFont("Segoe UI", 10))
+        self.confirm_input.setFont(get_font("Segoe UI", 10))
         # noinspection PyUnresolvedReferences
         self.confirm_input.textChanged.connect(self.on_confirm_changed)
         main_layout.addWidget(self.confirm_input)
@@ -249,7 +337,7 @@ class PasswordDialog(QDialog):
 
         # Match indicator
         self.match_label = QLabel("")
-        self.match_label.setFont(QFont("Segoe UI", 9))
+        self.match_label.setFont(get_font("Segoe UI", 9))
         self.match_label.setMinimumHeight(25)
         main_layout.addWidget(self.match_label)
 
@@ -262,7 +350,7 @@ class PasswordDialog(QDialog):
 
         self.confirm_button = QPushButton("✓ Create Password")
         self.confirm_button.setMinimumHeight(40)
-        self.confirm_button.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        self.confirm_button.setFont(get_font("Segoe UI", 10, QFont.Bold))
         self.confirm_button.setCursor(Qt.PointingHandCursor)
         self.confirm_button.setEnabled(False)
         # noinspection PyUnresolvedReferences
@@ -288,7 +376,7 @@ class PasswordDialog(QDialog):
 
         cancel_button = QPushButton("✕ Cancel")
         cancel_button.setMinimumHeight(40)
-        cancel_button.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        cancel_button.setFont(get_font("Segoe UI", 10, QFont.Bold))
         cancel_button.setCursor(Qt.PointingHandCursor)
         # noinspection PyUnresolvedReferences
         cancel_button.clicked.connect(self.reject)
@@ -312,70 +400,82 @@ class PasswordDialog(QDialog):
         self.setLayout(main_layout)
 
     def on_password_changed(self):
-        """Handle password input change."""
+        """Handle password input change; the update runs once typing pauses."""
+        self._strength_timer.start()
+
+    def _update_strength(self):
+        """Update the strength meter and feedback for the current password."""
         password = self.password_input.text()
-        score, level, feedback, color = PasswordStrengthMeter.calculate_strength(password)
+        score, level, feedback, _ = PasswordStrengthMeter._evaluate(password)
+        strength = _STRENGTH_KEYS[level]
 
         # Update strength bar
         self.strength_bar.setValue(score)
-        self.strength_bar.setStyleSheet(f"""
-            QProgressBar {{
-                border: 2px solid #ccc;
-                border-radius: 5px;
-                background-color: #f0f0f0;
-                text-align: center;
-            }}
-            QProgressBar::chunk {{
-                background-color: {color};
-                border-radius: 3px;
-            }}
-        """)
+        self._set_strength_property(self.strength_bar, strength)
 
         # Update strength level
         self.strength_level_label.setText(level)
-        self.strength_level_label.setStyleSheet(f"color: {color};")
+        self._set_strength_property(self.strength_level_label, strength)
 
         # Update feedback
-        feedback_text = "\n".join([f"• {msg}" for msg in feedback]) if feedback else "✓ Password meets all requirements!"
-        self.feedback_label.setText(feedback_text)
+        self.feedback_label.setText(_feedback_text(feedback))
 
         # Check match with confirm field
-        self.on_confirm_changed()
+        self._match_timer.stop()
+        self._update_match()
+
+    @staticmethod
+    def _set_strength_property(widget, strength):
+        """Switch a widget's strength property and re-polish it if it changed."""
+        if widget.property("strength") == strength:
+            return
+        widget.setProperty("strength", strength)
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
 
     def on_confirm_changed(self):
-        """Handle confirm password change."""
+        """Handle confirm password change; the update runs once typing pauses."""
+        self._match_timer.start()
+
+    def _update_match(self):
+        """Update the match indicator and the confirm button."""
         password = self.password_input.text()
         confirm = self.confirm_input.text()
 
         if not password or not confirm:
-            self.match_label.setText("")
-            self.confirm_button.setEnabled(False)
+            self._set_match("", None, False)
             return
 
-        if password == confirm:
-            score, level, _, _ = PasswordStrengthMeter.calculate_strength(password)
-
-            # Check minimum requirements
-            if len(password) < self.min_length:
-                self.match_label.setText(f"✗ Password must be at least {self.min_length} characters")
-                self.match_label.setStyleSheet("color: #ff6600;")
-                self.confirm_button.setEnabled(False)
-                return
-
-            # Check strength requirement
-            if score < 60:
-                self.match_label.setText("✗ Password is not strong enough (needs at least 60% strength)")
-                self.match_label.setStyleSheet("color: #ff6600;")
-                self.confirm_button.setEnabled(False)
-                return
-
-            self.match_label.setText("✓ Passwords match and are strong!")
-            self.match_label.setStyleSheet("color: #00cc00;")
-            self.confirm_button.setEnabled(True)
-        else:
-            self.match_label.setText("✗ Passwords do not match")
-            self.match_label.setStyleSheet("color: #ff0000;")
-            self.confirm_button.setEnabled(False)
+        # Cheap checks first; the strength score is only needed for a match
+        if password != confirm:
+            self._set_match("✗ Passwords do not match", "mismatch", False)
+            return
+
+        # Check minimum requirements
+        if len(password) < self.min_length:
+            self._set_match(f"✗ Password must be at least {self.min_length} characters", "warning", False)
+            return
+
+        # Check strength requirement
+        score, level, _, _ = PasswordStrengthMeter.calculate_strength(password)
+        if score < 60:
+            self._set_match("✗ Password is not strong enough (needs at least 60% strength)", "warning", False)
+            return
+
+        self._set_match("✓ Passwords match and are strong!", "ok", True)
+
+    def _set_match(self, text, style, enabled):
+        """
+        Show a match result and enable the confirm button accordingly.
+
+        The label is only restyled when the outcome color changes; style None
+        keeps the current one (the label is empty then).
+        """
+        self.match_label.setText(text)
+        if style is not None and style != self._match_style:
+            self._match_style = style
+            self.match_label.setStyleSheet(_MATCH_STYLES[style])
+        self.confirm_button.setEnabled(enabled)
 
     def toggle_password_visibility(self):
         """Toggle password visibility."""
@@ -0,0 +1,81 @@
+"""
+Table model backing the stored profiles table.
+"""
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class ProfileTableModel(QAbstractTableModel):
+    """Profile names and their current TOTP code text, one row per profile."""
+    
+    HEADERS = ("Profile Name", "TOTP Code")
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Number of profiles."""
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        """Name and code columns."""
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """Cell text, read straight from the row list."""
+        if role == Qt.DisplayRole and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Column titles."""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def append_rows(self, names):
+        """
+        Append one row per profile name, with an empty code column.
+
+        Returns:
+            int: Row of the first appended profile
+        """
+        first = len(self._rows)
+        self.insert_rows(first, names)
+        return first
+    
+    def insert_rows(self, row, names):
+        """Insert one row per profile name before ``row``, with empty codes."""
+        if names:
+            self.beginInsertRows(QModelIndex(), row, row + len(names) - 1)
+            self._rows[row:row] = ([name, ""] for name in names)
+            self.endInsertRows()
+    
+    def remove_row(self, row):
+        """Remove the row of one profile."""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+    
+    def clear(self):
+        """Remove every row."""
+        self.beginResetModel()
+        self._rows = []
+        self.endResetModel()
+    
+    def name(self, row):
+        """Profile name shown in a row."""
+        return self._rows[row][0]
+    
+    def find_row(self, name):
+        """Row showing a profile, or None."""
+        for row, (row_name, _) in enumerate(self._rows):
+            if row_name == name:
+                return row
+        return None
+    
+    def set_code(self, row, text):
+        """Set the code column text of one row."""
+        self._rows[row][1] = text
+        index = self.index(row, 1)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
\ No newline at end of file
@@ -7,96 +7,290 @@ import time
 import base64
 import secrets
 import pyotp
-import qrcode
 import os
-from io import BytesIO
-from urllib.parse import urlparse, parse_qs
-from PIL import Image
-from pyzbar.pyzbar import decode
-from PyQt5.QtCore import QTimer, Qt, pyqtSignal
-from PyQt5.QtGui import QPixmap, QIcon, QFont
+import re
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs, quote, unquote
+from PyQt5.QtCore import QTimer, Qt, QThreadPool
+from PyQt5.QtGui import QPixmap, QImage, QIcon, QFont
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit,
     QPushButton, QMessageBox, QFrame, QFileDialog, QGroupBox,
     QHBoxLayout, QProgressBar, QDialog, QFormLayout, QScrollArea
 )
+from utils.workers import Worker
+
+# Cheap shape check for Base32 input while typing; b32decode still guards start/upload.
+# Whole 8-character blocks, the last one optionally padded to a legal length
+# (2, 4, 5 or 7 data characters followed by 6, 4, 3 or 1 '=')
+_B32_RE = re.compile(r"(?:[A-Z2-7]{8})*(?:[A-Z2-7]{2}={6}|[A-Z2-7]{4}={4}|[A-Z2-7]{5}={3}|[A-Z2-7]{7}=)?")
+
+# Indigo Dark color scheme, set once on the dialog. Widgets are styled through their
+# objectName; "state" properties select the countdown band and the secret recommendation.
+_DIALOG_STYLE = """
+    QWidget {
+        background-color: #1c1c1c;
+        color: #d6d6e0;
+        font-family: 'Segoe UI', sans-serif;
+        font-size: 13px;
+    }
+    QLineEdit, QPlainTextEdit, QTextEdit, QSpinBox, QDoubleSpinBox, QComboBox {
+        background-color: #2a2a2a;
+        color: #e8e8f2;
+        border: 2px solid #303A52;
+        border-radius: 8px;
+        padding: 6px 10px;
+    }
+
+    QLineEdit:focus, QPlainTextEdit:focus, QSpinBox:focus, QDoubleSpinBox:focus {
+        border-color: #4b597a;
+        background-color: #333;
+    }
+    QPushButton {
+        background-color: #303A52;
+        color: #ffffff;
+        border: none;
+        border-radius: 8px;
+        padding: 10px 15px;
+        font-weight: normal;
+        font-size: 12px;
+    }
+
+
+    QPushButton:hover {
+        background-color: #3f4a66;
+    }
+
+    QPushButton:pressed {
+        background-color: #26304a;
+    }
+
+    QTabWidget::pane {
+        border: 2px solid #303A52;
+        border-radius: 12px;
+        background-color: #252525;
+        margin-top: -1px;
+    }
+    QLabel {
+        color: #e8eaed;
+    }
+    QFrame {
+        background-color: #1a1f2e;
+        border: none;
+    }
+
+    QGroupBox#panel {
+        font-weight: bold;
+        border: 2px solid #303A52;
+        border-radius: 10px;
+        margin-top: 1ex;
+        padding-top: 15px;
+        background-color: #252525;
+    }
+    QGroupBox#panel::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 8px;
+        color: #d6d6e0;
+        font-size: 14px;
+    }
+
+    QLabel#header {
+        font-size: 14px;
+        font-weight: bold;
+        color: #d6d6e0;
+    }
+    QLabel#fieldLabel {
+        font-size: 11px;
+        font-weight: 600;
+        color: #d6d6e0;
+    }
+    QLabel#recommendation {
+        font-size: 11px;
+        font-weight: bold;
+    }
+    QLabel#recommendation[state="ok"] {
+        color: #00e676;
+    }
+    QLabel#recommendation[state="warn"] {
+        color: #ff5252;
+    }
+
+    QLabel#qrPreview {
+        background-color: #ffffff;
+        border: 2px solid #303A52;
+        border-radius: 4px;
+        padding: 4px;
+    }
+
+    QGroupBox#totpGroup {
+        color: #d6d6e0;
+        border: 2px solid #00e676;
+        border-radius: 6px;
+        margin-top: 2px;
+        padding-top: 2px;
+        font-weight: 400;
+        font-size: 10px;
+        background-color: #1a1f2e;
+    }
+    QGroupBox#totpGroup::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        padding: 0px 2px;
+    }
+
+    QLabel#totpCode {
+        font-size: 40px;
+        font-weight: bold;
+        color: #00e676;
+        font-family: 'Courier New', monospace;
+        letter-spacing: 12px;
+        padding: 20px;
+        background-color: #0d2818;
+        border-radius: 4px;
+        min-height: 100px;
+    }
+    QLabel#totpCode[state="green"] {
+        font-size: 56px;
+    }
+    QLabel#totpCode[state="red"] {
+        font-size: 56px;
+        color: #ff5252;
+        background-color: #3d1212;
+    }
+
+    QLabel#countdown {
+        font-size: 14px;
+        font-weight: 500;
+        color: #d6d6e0;
+    }
+    QProgressBar#countdownBar {
+        border: 1px solid #3949ab;
+        border-radius: 3px;
+        background-color: #1a1f2e;
+        height: 12px;
+    }
+    QProgressBar#countdownBar[state="green"], QProgressBar#countdownBar[state="red"] {
+        height: 8px;
+    }
+    QProgressBar#countdownBar::chunk {
+        background-color: #00e676;
+        border-radius: 2px;
+    }
+    QProgressBar#countdownBar[state="red"]::chunk {
+        background-color: #ff5252;
+    }
+
+    QPushButton#copyButton {
+        background-color: #00e676;
+        color: #0f1419;
+        padding: 8px 16px;
+        font-weight: 600;
+    }
+    QPushButton#copyButton:hover {
+        background-color: #00c853;
+    }
+
+    QLabel#infoText {
+        background-color: #303A52;
+        padding: 12px;
+        border-radius: 4px;
+        font-size: 10px;
+        color: #d6d6e0;
+        border: 1px solid #2a2a2a;
+    }
+"""
+
+# Format_Mono colour table; index 1 is a dark module
+_MODULE_COLORS = [0xFFFFFFFF, 0xFF000000]
+
+
+def _matrix_image(matrix, box: int) -> QImage:
+    """Pack a QR module matrix into a 1-bit QImage with box x box pixel modules."""
+    width = len(matrix) * box
+    stride = (width + 31) // 32 * 4
+    pad = b"0" * (stride * 8 - width)
+    dots = (b"0" * box, b"1" * box)
+    # Each module row becomes one packed scanline, repeated box times
+    data = b"".join(
+        int(b"".join([dots[dark] for dark in row]) + pad, 2).to_bytes(stride, "big") * box
+        for row in matrix
+    )
+    image = QImage(data, width, width, stride, QImage.Format_Mono)
+    image.setColorTable(_MODULE_COLORS)
+    # Detach from the local buffer
+    return image.copy()
 
 
 class TOTPDialog(QDialog):
     """Live TOTP generator as a modal dialog with QR code & TOTP on right panel."""
 
+    QR_CACHE_SIZE = 16
+    _ICON = None
+    UPDATE_DELAY_MS = 300
+    # Inside of qr_label: 240 px fixed size minus its 2 px border and 4 px padding
+    QR_PREVIEW_SIZE = 228
+    # Longest side, in pixels, an uploaded image is shrunk to before the first decode attempt
+    DECODE_MAX_SIZE = 1600
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.totp = None
         self.qr_image = None
+        # otpauth URI behind the QR code currently shown
+        self._current_uri = None
+        self._last_band = None
+        self._last_code = None
+        self._last_remaining = None
+        # Code for the current 30 s window, and the TOTP object it came from
+        self._totp_window = -1
+        self._totp_code = "------"
+        self._totp_source = None
+        # Last secret a code was successfully generated from
+        self._last_valid_secret = None
+        # (secret, account, issuer) -> (full-size QImage, preview pixmap), least recently used first
+        self._qr_cache = OrderedDict()
+        # Fixed-parameter encoder, created on first use and then cleared and refilled on
+        # each cache miss. It is only used from _qr_pool, whose single thread keeps it
+        # from being shared.
+        self._qr = None
+        self._qr_pool = QThreadPool(self)
+        self._qr_pool.setMaxThreadCount(1)
+        self._workers = set()
+        # Bumped on every QR request so superseded background results are dropped
+        self._qr_gen_id = 0
+
+        # Coalesce rapid typing into a single update
+        self._pending_timer = QTimer(self)
+        self._pending_timer.setSingleShot(True)
+        self._pending_timer.setInterval(self.UPDATE_DELAY_MS)
+        self._pending_timer.timeout.connect(self._do_auto_update)
+
         self.init_ui()
+        # Single-shot countdown tick, re-armed at each wall-clock second boundary
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_totp)
-        self.timer.start(1000)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._on_tick)
+        self._schedule_next()
         self.setModal(True)  # Ensure it's modal
 
+    @classmethod
+    def _icon(cls):
+        """Load the window icon once per process."""
+        if cls._ICON is None:
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            icon_path = os.path.join(script_dir, "assets/icons/icon.ico")
+            cls._ICON = QIcon(icon_path) if os.path.exists(icon_path) else QIcon()
+        return cls._ICON
+
     def init_ui(self):
         """Initialize UI with left panel (controls) and right panel (QR + TOTP)."""
         self.setWindowTitle("TOTP Manager - Security Administration")
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        icon_path = os.path.join(script_dir, "assets/icons/icon.ico")
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
+        self.setWindowIcon(self._icon())
         self.setFixedSize(700, 650)
 
-        # Indigo Dark color scheme
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #1c1c1c;
-                color: #d6d6e0;
-                font-family: 'Segoe UI', sans-serif;
-                font-size: 13px;
-            }
-            QLineEdit, QPlainTextEdit, QTextEdit, QSpinBox, QDoubleSpinBox, QComboBox {
-                background-color: #2a2a2a;
-                color: #e8e8f2;
-                border: 2px solid #303A52;
-                border-radius: 8px;
-                padding: 6px 10px;
-            }
-
-            QLineEdit:focus, QPlainTextEdit:focus, QSpinBox:focus, QDoubleSpinBox:focus {
-                border-color: #4b597a;
-                background-color: #333;
-            }
-            QPushButton {
-                background-color: #303A52;
-                color: #ffffff;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 15px;
-                font-weight: normal;
-                font-size: 12px;
-            }
-
-
-            QPushButton:hover {
-                background-color: #3f4a66;
-            }
-
-            QPushButton:pressed {
-                background-color: #26304a;
-            }
-
-            QTabWidget::pane {
-                border: 2px solid #303A52;
-                border-radius: 12px;
-                background-color: #252525;
-                margin-top: -1px;
-            }
-            QLabel {
-                color: #e8eaed;
-            }
-            QFrame {
-                background-color: #1a1f2e;
-                border: none;
-            }
-        """)
+        self.setStyleSheet(_DIALOG_STYLE)
 
         # Main horizontal layout: LEFT | RIGHT
         main_layout = QHBoxLayout()
@@ -109,34 +303,17 @@ class TOTPDialog(QDialog):
 
         # Header Section
         header = QLabel("Security Key Configuration")
-        header.setStyleSheet("font-size: 14px; font-weight: bold; color: #d6d6e0;")
+        header.setObjectName("header")
         left_layout.addWidget(header)
 
         # Input Section with grouped layout
         input_group = QGroupBox("Secret Key Input")
-        input_group.setStyleSheet("""
-                QGroupBox {
-                    font-weight: bold;
-                    border: 2px solid #303A52;
-                    border-radius: 10px;
-                    margin-top: 1ex;
-                    padding-top: 15px;
-                    background-color: #252525;
-                }
-
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 8px;
-                    color: #d6d6e0;
-                    font-size: 14px;
-                }
-        """)
+        input_group.setObjectName("panel")
         input_layout = QVBoxLayout()
         input_layout.setSpacing(10)
 
         secret_label = QLabel("Base32 Secret Key")
-        secret_label.setStyleSheet("font-size: 11px; font-weight: 600; color: #d6d6e0;")
+        secret_label.setObjectName("fieldLabel")
         input_layout.addWidget(secret_label)
 
         self.secret_input = QLineEdit()
@@ -171,29 +348,12 @@ class TOTPDialog(QDialog):
 
         # Account Details Section
         account_group = QGroupBox("Account Information")
-        account_group.setStyleSheet("""
-                QGroupBox {
-                    font-weight: bold;
-                    border: 2px solid #303A52;
-                    border-radius: 10px;
-                    margin-top: 1ex;
-                    padding-top: 15px;
-                    background-color: #252525;
-                }
-
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 8px;
-                    color: #d6d6e0;
-                    font-size: 14px;
-                }
-        """)
+        account_group.setObjectName("panel")
         account_layout = QVBoxLayout()
         account_layout.setSpacing(10)
 
         account_label = QLabel("Account Name")
-        account_label.setStyleSheet("font-size: 11px; font-weight: 600; color: #d6d6e0;")
+        account_label.setObjectName("fieldLabel")
         account_layout.addWidget(account_label)
 
         self.account_input = QLineEdit()
@@ -201,7 +361,7 @@ class TOTPDialog(QDialog):
         account_layout.addWidget(self.account_input)
 
         issuer_label = QLabel("Issuer")
-        issuer_label.setStyleSheet("font-size: 11px; font-weight: 600; color: #d6d6e0;")
+        issuer_label.setObjectName("fieldLabel")
         account_layout.addWidget(issuer_label)
 
         self.issuer_input = QLineEdit()
@@ -214,7 +374,7 @@ class TOTPDialog(QDialog):
         # Recommendation label
         self.recommendation_label = QLabel("")
         self.recommendation_label.setAlignment(Qt.AlignCenter)
-        self.recommendation_label.setStyleSheet("font-size: 11px; font-weight: bold;")
+        self.recommendation_label.setObjectName("recommendation")
         left_layout.addWidget(self.recommendation_label)
 
         left_layout.addStretch()
@@ -225,39 +385,15 @@ class TOTPDialog(QDialog):
 
         # QR Code Display Section
         qr_group = QGroupBox("QR Code Preview")
-        qr_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #303A52;
-                border-radius: 10px;
-                margin-top: 1ex;
-                padding-top: 15px;
-                background-color: #252525;
-            }
-
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 8px;
-                color: #d6d6e0;
-                font-size: 14px;
-            }
-        """)
+        qr_group.setObjectName("panel")
         qr_layout = QVBoxLayout()
         qr_layout.setAlignment(Qt.AlignCenter)
 
         self.qr_label = QLabel()
         self.qr_label.setAlignment(Qt.AlignCenter)
         self.qr_label.setFixedSize(240, 240)
-        self.qr_label.setScaledContents(True)
-        self.qr_label.setStyleSheet("""
-            QLabel {
-                background-color: #ffffff;
-                border: 2px solid #303A52;
-                border-radius: 4px;
-                padding: 4px;
-            }
-        """)
+        self.qr_label.setScaledContents(False)
+        self.qr_label.setObjectName("qrPreview")
         qr_layout.addWidget(self.qr_label)
 
         qr_group.setLayout(qr_layout)
@@ -266,40 +402,14 @@ class TOTPDialog(QDialog):
         # TOTP Display Section
         totp_group = QGroupBox("Current TOTP Code")
         totp_group.setFixedHeight(220)
-        totp_group.setStyleSheet("""
-            QGroupBox {
-                color: #d6d6e0;
-                border: 2px solid #00e676;
-                border-radius: 6px;
-                margin-top: 2px;
-                padding-top: 2px;
-                font-weight: 400;
-                font-size: 10px;
-                background-color: #1a1f2e;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0px 2px;
-            }
-        """)
+        totp_group.setObjectName("totpGroup")
         totp_layout = QVBoxLayout()
         totp_layout.setSpacing(12)
         totp_layout.setAlignment(Qt.AlignCenter)
 
         self.totp_label = QLabel("------")
         self.totp_label.setAlignment(Qt.AlignCenter)
-        self.totp_label.setStyleSheet("""
-            font-size: 40px; 
-            font-weight: bold; 
-            color: #00e676;
-            font-family: 'Courier New', monospace;
-            letter-spacing: 12px;
-            padding: 20px;
-            background-color: #0d2818;
-            border-radius: 4px;
-            min-height: 100px;
-        """)
+        self.totp_label.setObjectName("totpCode")
         totp_layout.addWidget(self.totp_label)
 
         # Countdown Bar
@@ -308,25 +418,14 @@ class TOTPDialog(QDialog):
 
         self.countdown_label = QLabel("Time Remaining: 30s")
         self.countdown_label.setAlignment(Qt.AlignCenter)
-        self.countdown_label.setStyleSheet("font-size: 14px; font-weight: 500; color: #d6d6e0;")
+        self.countdown_label.setObjectName("countdown")
         countdown_container.addWidget(self.countdown_label)
 
         # Progress bar for countdown visualization
         self.countdown_bar = QProgressBar()
         self.countdown_bar.setMaximum(30)
         self.countdown_bar.setValue(30)
-        self.countdown_bar.setStyleSheet("""
-            QProgressBar {
-                border: 1px solid #3949ab;
-                border-radius: 3px;
-                background-color: #1a1f2e;
-                height: 12px;
-            }
-            QProgressBar::chunk {
-                background-color: #00e676;
-                border-radius: 2px;
-            }
-        """)
+        self.countdown_bar.setObjectName("countdownBar")
         countdown_container.addWidget(self.countdown_bar)
 
         totp_layout.addLayout(countdown_container)
@@ -334,17 +433,7 @@ class TOTPDialog(QDialog):
         # Copy TOTP button
         copy_totp_btn = QPushButton("📋 Copy Code")
         copy_totp_btn.clicked.connect(self._copy_totp_code)
-        copy_totp_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #00e676;
-                color: #0f1419;
-                padding: 8px 16px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background-color: #00c853;
-            }
-        """)
+        copy_totp_btn.setObjectName("copyButton")
         totp_layout.addWidget(copy_totp_btn)
 
         totp_group.setLayout(totp_layout)
@@ -357,14 +446,7 @@ class TOTPDialog(QDialog):
         )
         info_text.setWordWrap(True)
         info_text.setAlignment(Qt.AlignCenter)
-        info_text.setStyleSheet("""
-            background-color: #303A52; 
-            padding: 12px; 
-            border-radius: 4px; 
-            font-size: 10px;
-            color: #d6d6e0;
-            border: 1px solid #2a2a2a;
-        """)
+        info_text.setObjectName("infoText")
         right_layout.addWidget(info_text)
 
         # ============== Combine Left and Right Panels ==============
@@ -377,32 +459,31 @@ class TOTPDialog(QDialog):
     # TOTP Auto Update
     # ============================================================================
     def auto_update_totp(self):
+        """Schedule an update once the user stops typing."""
+        self._pending_timer.start()
+
+    def _do_auto_update(self):
         """Automatically generate QR and TOTP when a valid secret is entered."""
         secret = self.secret_input.text().strip().replace(" ", "")
 
         if not secret:
             self.totp_label.setText("------")
             self.countdown_label.setText("Time Remaining: 30s")
-            self.qr_label.clear()
+            self._last_code = self._last_remaining = None
+            self._clear_qr()
             self.totp = None
-            self.qr_image = None
             self.recommendation_label.setText("")
             return
 
-        try:
-            # Try Base32 decode
-            base64.b32decode(secret.upper(), casefold=True)
-            is_base32 = True
-        except Exception:
-            is_base32 = False
+        is_base32 = _B32_RE.fullmatch(secret.upper()) is not None
 
         # Show recommendation
         if is_base32 and len(secret) == 32:
             self.recommendation_label.setText("✅ Recommended: Base32 secret (32 chars)")
-            self.recommendation_label.setStyleSheet("color: #00e676; font-size: 11px; font-weight: bold;")
+            self._set_state(self.recommendation_label, "ok")
         else:
             self.recommendation_label.setText("⚠️ Not recommended: Use Base32 (32 chars only)")
-            self.recommendation_label.setStyleSheet("color: #ff5252; font-size: 11px; font-weight: bold;")
+            self._set_state(self.recommendation_label, "warn")
 
         # Only generate TOTP if Base32
         if is_base32:
@@ -414,9 +495,9 @@ class TOTPDialog(QDialog):
         else:
             self.totp_label.setText("Invalid Secret")
             self.countdown_label.setText("Time Remaining: --")
-            self.qr_label.clear()
+            self._last_code = self._last_remaining = None
+            self._clear_qr()
             self.totp = None
-            self.qr_image = None
 
     # ============================================================================
     # Secret Generation
@@ -439,110 +520,170 @@ class TOTPDialog(QDialog):
             QMessageBox.warning(self, "Error", "Please enter a Base32 TOTP secret.")
             return
 
-        try:
-            base64.b32decode(secret.upper(), casefold=True)
-        except Exception as e:
-            QMessageBox.critical(self, "Invalid Secret", f"Base32 decode failed: {e}")
-            return
+        # The live update already decoded this secret when it produced a code
+        if secret != self._last_valid_secret:
+            try:
+                base64.b32decode(secret.upper(), casefold=True)
+            except Exception as e:
+                QMessageBox.critical(self, "Invalid Secret", f"Base32 decode failed: {e}")
+                return
 
         self.totp = pyotp.TOTP(secret)
         self.generate_qr(secret, account, issuer)
         self.update_totp()
 
-    def update_totp(self):
+    def _schedule_next(self, now_ms=None):
+        """Arm the countdown timer for the next second boundary."""
+        if now_ms is None:
+            now_ms = time.time_ns() // 1_000_000
+        self.timer.start(max(1, 1000 - now_ms % 1000))
+
+    def _on_tick(self):
+        """Refresh the countdown and re-arm the timer from a single clock read."""
+        now_ms = time.time_ns() // 1_000_000
+        self.update_totp(now_ms // 1000)
+        self._schedule_next(now_ms)
+
+    def update_totp(self, now=None):
         """Update the displayed TOTP code and countdown."""
         if not self.totp:
-            self.totp_label.setText("------")
-            self.countdown_label.setText("Time Remaining: 30s")
-            self.countdown_bar.setValue(30)
-            self._update_progress_color(30)
+            self._show_code("------", 30)
             return
         try:
-            current_code = self.totp.now()
-            remaining = 30 - (int(time.time()) % 30)
-            self.totp_label.setText(current_code)
-            self.countdown_label.setText(f"Time Remaining: {remaining:02d}s")
-            self.countdown_bar.setValue(remaining)
-            self._update_progress_color(remaining)
+            if now is None:
+                now = time.time_ns() // 1_000_000_000
+            window, elapsed = divmod(now, 30)
+            if window != self._totp_window or self.totp is not self._totp_source:
+                self._totp_code = self.totp.at(now)
+                self._totp_window = window
+                self._totp_source = self.totp
+                self._last_valid_secret = self.totp.secret
+            self._show_code(self._totp_code, 30 - elapsed)
         except Exception as e:
             self.totp_label.setText("ERROR")
             self.countdown_label.setText(str(e))
+            self._last_code = self._last_remaining = None
+
+    def _show_code(self, code: str, remaining: int):
+        """Display a code and countdown, touching only the widgets whose value changed."""
+        if code != self._last_code:
+            self._last_code = code
+            self.totp_label.setText(code)
+        if remaining != self._last_remaining:
+            self._last_remaining = remaining
+            self.countdown_label.setText(f"Time Remaining: {remaining:02d}s")
+            self.countdown_bar.setValue(remaining)
+            self._update_progress_color(remaining)
 
     def _update_progress_color(self, remaining: int):
         """Update progress bar color based on remaining time."""
         percentage = (remaining / 30) * 100
 
-        if percentage < 33:
-            # Red for less than 33%
-            self.countdown_bar.setStyleSheet("""
-                QProgressBar {
-                    border: 1px solid #3949ab;
-                    border-radius: 3px;
-                    background-color: #1a1f2e;
-                    height: 8px;
-                }
-                QProgressBar::chunk {
-                    background-color: #ff5252;
-                    border-radius: 2px;
-                }
-            """)
-            self.totp_label.setStyleSheet("""
-                font-size: 56px; 
-                font-weight: bold; 
-                color: #ff5252;
-                font-family: 'Courier New', monospace;
-                letter-spacing: 12px;
-                padding: 20px;
-                background-color: #3d1212;
-                border-radius: 4px;
-                min-height: 100px;
-            """)
-        else:
-            # Green for 33% and above
-            self.countdown_bar.setStyleSheet("""
-                QProgressBar {
-                    border: 1px solid #3949ab;
-                    border-radius: 3px;
-                    background-color: #1a1f2e;
-                    height: 8px;
-                }
-                QProgressBar::chunk {
-                    background-color: #00e676;
-                    border-radius: 2px;
-                }
-            """)
-            self.totp_label.setStyleSheet("""
-                font-size: 56px; 
-                font-weight: bold; 
-                color: #00e676;
-                font-family: 'Courier New', monospace;
-                letter-spacing: 12px;
-                padding: 20px;
-                background-color: #0d2818;
-                border-radius: 4px;
-                min-height: 100px;
-            """)
+        # Red for less than 33%, green otherwise; restyle only when the band flips
+        band = "red" if percentage < 33 else "green"
+        if band == self._last_band:
+            return
+        self._last_band = band
+        self._set_state(self.countdown_bar, band)
+        self._set_state(self.totp_label, band)
+
+    @staticmethod
+    def _set_state(widget, state: str):
+        """Switch a widget's "state" style property and re-polish it if it changed."""
+        if widget.property("state") == state:
+            return
+        widget.setProperty("state", state)
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
 
     # ============================================================================
     # QR Generation
     # ============================================================================
     def generate_qr(self, secret: str, account: str, issuer: str):
-        """Generate QR code from secret."""
-        uri = f"otpauth://totp/{issuer}:{account}?secret={secret}&issuer={issuer}&algorithm=SHA1&digits=6&period=30"
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_M,
-            box_size=10,
-            border=4
+        """Show the QR code for a secret, building it in the background if it isn't cached."""
+        key = (secret, account, issuer)
+        self._qr_gen_id += 1
+        self._current_uri = self._build_uri(secret, account, issuer)
+        cached = self._qr_cache.get(key)
+        if cached is not None:
+            self._qr_cache.move_to_end(key)
+            self.qr_image, pixmap = cached
+            self.qr_label.setPixmap(pixmap)
+            return
+
+        gen_id = self._qr_gen_id
+        self.qr_image = None
+        self._run_worker(
+            lambda images, error: self._on_qr_built(gen_id, key, images, error),
+            self._build_qr, self._current_uri
+        )
+
+    @staticmethod
+    def _build_uri(secret: str, account: str, issuer: str) -> str:
+        """Build the otpauth URI for a secret, escaping the account and issuer."""
+        issuer = quote(issuer)
+        return (
+            f"otpauth://totp/{issuer}:{quote(account, safe='@')}?secret={secret}"
+            f"&issuer={issuer}&algorithm=SHA1&digits=6&period=30"
         )
+
+    def _build_qr(self, uri: str):
+        """Encode a URI into (full-size image, preview image). Runs on the worker thread."""
+        qr = self._qr
+        if qr is None:
+            import qrcode
+
+            qr = self._qr = qrcode.QRCode(
+                version=1,
+                error_correction=qrcode.constants.ERROR_CORRECT_M,
+                box_size=10,
+                border=4
+            )
+        qr.clear()
+        # make(fit=True) searches upward from the current version, so start small again
+        qr.version = 1
         qr.add_data(uri)
         qr.make(fit=True)
-        self.qr_image = qr.make_image(fill_color="black", back_color="white")
-        buffer = BytesIO()
-        self.qr_image.save(buffer, format="PNG")
-        pixmap = QPixmap()
-        pixmap.loadFromData(buffer.getvalue())
-        self.qr_label.setPixmap(pixmap.scaled(260, 260, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        # Packed straight from the module matrix instead of rasterizing through PIL
+        matrix = qr.get_matrix()
+        # Whole-pixel modules for the preview so the label never has to resample it
+        preview_box = max(1, self.QR_PREVIEW_SIZE // len(matrix))
+        return _matrix_image(matrix, qr.box_size), _matrix_image(matrix, preview_box)
+
+    def _on_qr_built(self, gen_id: int, key: tuple, images, error: str):
+        """Show a QR image built in the background unless a newer request replaced it."""
+        if gen_id != self._qr_gen_id:
+            return
+        if error:
+            self.qr_label.clear()
+            QMessageBox.warning(self, "Error", f"Failed to generate QR code: {error}")
+            return
+        image, preview = images
+        pixmap = QPixmap.fromImage(preview)
+        self._qr_cache[key] = (image, pixmap)
+        if len(self._qr_cache) > self.QR_CACHE_SIZE:
+            self._qr_cache.popitem(last=False)
+        self.qr_image = image
+        self.qr_label.setPixmap(pixmap)
+
+    def _clear_qr(self):
+        """Clear the QR preview and drop any build still in flight."""
+        self._qr_gen_id += 1
+        self.qr_label.clear()
+        self.qr_image = None
+        self._current_uri = None
+
+    def _run_worker(self, callback, fn, *args):
+        """Run fn(*args) on the QR thread and pass (result, error) to callback."""
+        worker = Worker(fn, *args)
+
+        def finished(result, error):
+            self._workers.discard(worker)
+            callback(result, error)
+
+        worker.signals.finished.connect(finished)
+        self._workers.add(worker)
+        self._qr_pool.start(worker)
 
     # ============================================================================
     # Save QR Image with URI backup
@@ -561,17 +702,13 @@ class TOTPDialog(QDialog):
 
         try:
             # Save the QR image
-            self.qr_image.save(file_path, format="PNG")
-
-            # Save the TOTP URI alongside as .txt
-            secret = self.secret_input.text().strip().replace(" ", "")
-            account = self.account_input.text().strip() or "user@example.com"
-            issuer = self.issuer_input.text().strip() or "MyApp"
-            totp_uri = f"otpauth://totp/{issuer}:{account}?secret={secret}&issuer={issuer}&algorithm=SHA1&digits=6&period=30"
+            if not self.qr_image.save(file_path, "PNG"):
+                raise OSError(f"Could not write {file_path}")
 
+            # Save the URI of the shown QR code alongside as .txt
             txt_path = file_path.rsplit(".", 1)[0] + ".txt"
             with open(txt_path, "w") as f:
-                f.write(totp_uri)
+                f.write(self._current_uri)
 
             QMessageBox.information(
                 self,
@@ -598,64 +735,106 @@ class TOTPDialog(QDialog):
             return
 
         try:
-            secret = None
-
             if file_path.lower().endswith(".txt"):
                 with open(file_path, "r") as f:
                     content = f.read().strip().replace(" ", "")
 
                 if content.upper().startswith("OTPAUTH://TOTP/"):
                     # It's a full TOTP URI
-                    parsed = urlparse(content)
-                    params = parse_qs(parsed.query)
-                    secret = params.get("secret", [None])[0]
-                    account = parsed.path.split(":")[-1] if ":" in parsed.path else "user@example.com"
-                    issuer = params.get("issuer", [None])[0] or "MyApp"
-                    self.account_input.setText(account)
-                    self.issuer_input.setText(issuer)
+                    secret = self._apply_uri(content)
                 else:
                     # Treat as plain Base32
                     base64.b32decode(content.upper(), casefold=True)
                     secret = content
+                self._load_secret(secret)
 
             else:
-                # It's an image
-                img = Image.open(file_path)
-                decoded = decode(img)
-                if not decoded:
-                    raise ValueError("No QR code found in the image.")
-
-                qr_data = decoded[0].data.decode("utf-8").strip()
-                try:
-                    base64.b32decode(qr_data.upper(), casefold=True)
-                    secret = qr_data
-                except Exception:
-                    if qr_data.startswith("otpauth://totp/"):
-                        parsed = urlparse(qr_data)
-                        params = parse_qs(parsed.query)
-                        secret = params.get("secret", [None])[0]
-                        account = parsed.path.split(":")[-1] if ":" in parsed.path else "user@example.com"
-                        issuer = params.get("issuer", [None])[0] or "MyApp"
-                        self.account_input.setText(account)
-                        self.issuer_input.setText(issuer)
-                    else:
-                        raise ValueError("QR code is not a valid Base32 key or URI.")
-
-            if not secret:
-                raise ValueError("No valid secret found.")
-
-            self.secret_input.setText(secret)
-            account = self.account_input.text().strip() or "user@example.com"
-            issuer = self.issuer_input.text().strip() or "MyApp"
+                # It's an image; decode it in the background
+                self._run_worker(self._on_image_decoded, self._decode_file, file_path)
 
-            self.totp = pyotp.TOTP(secret)
-            self.generate_qr(secret, account, issuer)
-            self.update_totp()
-            QMessageBox.information(self, "Success", "✓ Key loaded successfully!")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load key: {e}")
+
+    def _on_image_decoded(self, qr_data, error: str):
+        """Load the key from a QR image decoded in the background."""
+        try:
+            if error:
+                raise ValueError(error)
+
+            try:
+                base64.b32decode(qr_data.upper(), casefold=True)
+                secret = qr_data
+            except Exception:
+                if qr_data.startswith("otpauth://totp/"):
+                    secret = self._apply_uri(qr_data)
+                else:
+                    raise ValueError("QR code is not a valid Base32 key or URI.")
+
+            self._load_secret(secret)
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load key: {e}")
 
+    def _apply_uri(self, uri: str):
+        """Fill account and issuer from an otpauth URI and return its secret."""
+        parsed = urlparse(uri)
+        params = parse_qs(parsed.query)
+        # The label is percent-encoded, as _build_uri writes it
+        account = unquote(parsed.path.split(":")[-1]) if ":" in parsed.path else "user@example.com"
+        issuer = params.get("issuer", [None])[0] or "MyApp"
+        self.account_input.setText(account)
+        self.issuer_input.setText(issuer)
+        return params.get("secret", [None])[0]
+
+    def _load_secret(self, secret):
+        """Start generating codes for an uploaded secret."""
+        if not secret:
+            raise ValueError("No valid secret found.")
+
+        self.secret_input.setText(secret)
+        account = self.account_input.text().strip() or "user@example.com"
+        issuer = self.issuer_input.text().strip() or "MyApp"
+
+        self.totp = pyotp.TOTP(secret)
+        self.generate_qr(secret, account, issuer)
+        self.update_totp()
+        QMessageBox.information(self, "Success", "✓ Key loaded successfully!")
+
+    def _decode_file(self, file_path: str) -> str:
+        """Read the first QR code in an image file. Runs on the worker thread."""
+        from PIL import Image
+
+        decoded = self._decode_image(Image.open(file_path))
+        if not decoded:
+            raise ValueError("No QR code found in the image.")
+        return decoded[0].data.decode("utf-8").strip()
+
+    def _decode_image(self, img):
+        """Decode QR codes from an image, trying a downscaled grayscale copy first."""
+        from PIL import Image, ImageOps
+        from pyzbar.pyzbar import decode
+
+        # JPEGs can decode straight to a reduced grayscale image; other formats ignore this
+        img.draft("L", (self.DECODE_MAX_SIZE, self.DECODE_MAX_SIZE))
+        gray = img.convert("L")
+        small = gray.copy()
+        small.thumbnail((self.DECODE_MAX_SIZE, self.DECODE_MAX_SIZE), Image.BILINEAR)
+
+        decoded = decode(small)
+        if not decoded and small.size != gray.size:
+            decoded = decode(gray)
+        if not decoded:
+            # Light-on-dark codes
+            decoded = decode(ImageOps.invert(gray))
+        return decoded
+
+    def done(self, result):
+        """Stop the timers and let background QR work finish before closing."""
+        self.timer.stop()
+        self._pending_timer.stop()
+        self._qr_pool.waitForDone()
+        super().done(result)
+
     def _copy_totp_code(self):
         """Copy current TOTP code to clipboard."""
         clipboard = QApplication.clipboard()
@@ -2,12 +2,41 @@
 UI Builder - constructs all UI elements.
 """
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox,
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox,
+    QTableView, QHeaderView, QAbstractItemView
 )
-from PyQt5.QtGui import QFont, QPixmap
+from PyQt5.QtGui import QFont, QPixmap, QPainter
 from PyQt5.QtCore import Qt
 from config import QR_CODE_SIZE
+from ui.fonts import get_font
+from ui.profile_table_model import ProfileTableModel
+
+_STATUS_STYLE = """
+    QLabel {
+        color: #ffffff;
+        background-color: #333333;
+        border-radius: 6px;
+        padding: 6px;
+    }
+"""
+
+_TOTP_STYLE = """
+    QLabel {
+        color: #39ff14;
+        padding: 20px;
+        background-color: #1e1e1e;
+        border-radius: 8px;
+        border: 2px solid #39ff14;
+    }
+"""
+
+_QR_STYLE = """
+    QLabel {
+        border: 2px solid #ccc;
+        background-color: white;
+        border-radius: 8px;
+    }
+"""
 
 
 class UIBuilder:
@@ -17,13 +46,15 @@ class UIBuilder:
         self.main_window = main_window
         self.label = None
         self.profile_table = None
+        self.profile_model = None
         self.totp_label = None
         self.qr_label = None
+        self.qr_placeholder = None
         self.status_label = None
     
     def build(self):
         """Build entire UI."""
-        central_widget = QWidget()
+        central_widget = QWidget(self.main_window)
         self.main_window.setCentralWidget(central_widget)
         main_layout = QVBoxLayout(central_widget)
         main_layout.setContentsMargins(10, 10, 10, 10)
@@ -36,87 +67,108 @@ class UIBuilder:
     
     def _build_header(self, layout):
         """Build header label."""
-        self.label = QLabel("🔄 Select a profile or upload QR code")
-        self.label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        self.label = QLabel("🔄 Select a profile or upload QR code", layout.parentWidget())
+        self.label.setFont(get_font("Segoe UI", 12, QFont.Bold))
         self.label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.label)
     
     def _build_profile_table(self, layout):
         """Build profile table."""
-        profile_group = QGroupBox("📋 Stored Profiles")
-        profile_group.setFont(QFont("Segoe UI", 10, QFont.Bold))
-        profile_layout = QVBoxLayout()
+        profile_group = QGroupBox("📋 Stored Profiles", layout.parentWidget())
+        profile_group.setFont(get_font("Segoe UI", 10, QFont.Bold))
+        profile_layout = QVBoxLayout(profile_group)
         
-        self.profile_table = QTableWidget(0, 2)
-        self.profile_table.setHorizontalHeaderLabels(["Profile Name", "TOTP Code"])
+        self.profile_table = QTableView(profile_group)
+        self.profile_model = ProfileTableModel(self.profile_table)
+        self.profile_table.setModel(self.profile_model)
         header = self.profile_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Stretch)
         header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.profile_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.profile_table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.profile_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.profile_table.verticalHeader().setVisible(False)
+        # Fixed row heights and single-line cells: no per-row size hints
+        # while painting or scrolling
+        vertical_header = self.profile_table.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        self.profile_table.setWordWrap(False)
+        self.profile_table.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.profile_table.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
         self.profile_table.setAlternatingRowColors(True)
         
         profile_layout.addWidget(self.profile_table)
-        profile_group.setLayout(profile_layout)
         layout.addWidget(profile_group, 3)
     
+    def append_profile_rows(self, names):
+        """
+        Append one table row per profile name, with an empty code column.
+
+        The rows are inserted in a single batch so the table lays out and
+        repaints once instead of once per row.
+
+        Returns:
+            int: Row of the first appended profile
+        """
+        return self.profile_model.append_rows(names)
+    
     def _build_status_label(self, layout):
         """Build status label."""
-        self.status_label = QLabel("Ready")
-        self.status_label.setFont(QFont("Segoe UI", 20, QFont.Normal))
+        self.status_label = QLabel("Ready", layout.parentWidget())
+        self.status_label.setFont(get_font("Segoe UI", 20, QFont.Normal))
         self.status_label.setAlignment(Qt.AlignCenter)
-        self.status_label.setStyleSheet("""
-            QLabel {
-                color: #ffffff;
-                background-color: #333333;
-                border-radius: 6px;
-                padding: 6px;
-            }
-        """)
+        self.status_label.setStyleSheet(_STATUS_STYLE)
         layout.addWidget(self.status_label)
     
     def _build_bottom_section(self, layout):
         """Build TOTP and QR code sections."""
+        parent = layout.parentWidget()
         bottom_layout = QHBoxLayout()
         
         # TOTP Group
-        totp_group = QGroupBox("⏱️ Current TOTP Code")
-        totp_group.setFont(QFont("Segoe UI", 20, QFont.Bold))
-        totp_layout = QVBoxLayout()
-        self.totp_label = QLabel("------")
-        self.totp_label.setFont(QFont("Consolas", 20, QFont.Bold))
+        totp_group = QGroupBox("⏱️ Current TOTP Code", parent)
+        totp_group.setFont(get_font("Segoe UI", 20, QFont.Bold))
+        totp_layout = QVBoxLayout(totp_group)
+        self.totp_label = QLabel("------", totp_group)
+        self.totp_label.setFont(get_font("Consolas", 20, QFont.Bold))
         self.totp_label.setAlignment(Qt.AlignCenter)
-        self.totp_label.setStyleSheet("""
-            QLabel {
-                color: #39ff14;
-                padding: 20px;
-                background-color: #1e1e1e;
-                border-radius: 8px;
-                border: 2px solid #39ff14;
-            }
-        """)
+        self.totp_label.setStyleSheet(_TOTP_STYLE)
         totp_layout.addWidget(self.totp_label)
-        totp_group.setLayout(totp_layout)
         bottom_layout.addWidget(totp_group, 1)
         
         # QR Group
-        qr_group = QGroupBox("📷 QR Code Preview")
-        qr_group.setFont(QFont("Segoe UI", 10, QFont.Bold))
-        qr_layout = QVBoxLayout()
-        self.qr_label = QLabel("No QR Code")
+        qr_group = QGroupBox("📷 QR Code Preview", parent)
+        qr_group.setFont(get_font("Segoe UI", 10, QFont.Bold))
+        qr_layout = QVBoxLayout(qr_group)
+        self.qr_label = QLabel(qr_group)
         self.qr_label.setFixedSize(QR_CODE_SIZE, QR_CODE_SIZE)
-        self.qr_label.setStyleSheet("""
-            QLabel {
-                border: 2px solid #ccc;
-                background-color: white;
-                border-radius: 8px;
-            }
-        """)
+        self.qr_label.setStyleSheet(_QR_STYLE)
         self.qr_label.setAlignment(Qt.AlignCenter)
+        self.qr_placeholder = self._build_qr_placeholder()
+        self.qr_label.setPixmap(self.qr_placeholder)
         qr_layout.addWidget(self.qr_label, 0, Qt.AlignCenter)
-        qr_group.setLayout(qr_layout)
         bottom_layout.addWidget(qr_group, 1)
         
-        layout.addLayout(bottom_layout, 2)
\ No newline at end of file
+        layout.addLayout(bottom_layout, 2)
+    
+    def _build_qr_placeholder(self):
+        """
+        Render the "No QR Code" placeholder once.
+
+        Showing it is then a plain setPixmap, the same as showing a QR
+        code, with no text layout in the label.
+
+        Returns:
+            QPixmap: Placeholder filling the inside of the QR label border
+        """
+        # Inside the 2 px border; transparent so the rounded white
+        # background of the label shows through at the corners
+        size = QR_CODE_SIZE - 4
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.transparent)
+        app_font = QApplication.font()
+        painter = QPainter(pixmap)
+        painter.setFont(get_font(app_font.family(), app_font.pointSize(), QFont.Normal))
+        painter.drawText(pixmap.rect(), Qt.AlignCenter, "No QR Code")
+        painter.end()
+        return pixmap
\ No newline at end of file
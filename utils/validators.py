@@ -3,6 +3,25 @@ Validation utilities for TokenX TOTP Manager.
 """
 import re
 import os
+import stat
+import string
+
+# Compiled once; validation runs on every profile load and import
+_RE_PROFILE_NAME = re.compile(r'^[\w.@-]+$')
+_RE_TOTP_SECRET = re.compile(r'[A-Za-z2-7]+={0,2}')
+_RE_SANITIZE = re.compile(r'[^\w.@-]')
+# Scheme, OTP type and a secret query parameter, checked in one pass
+_RE_OTPAUTH = re.compile(r'^otpauth://(?:totp|hotp)/[^?]*\?(?=.*\bsecret=)')
+
+# ASCII characters allowed in profile names; deleting them from a valid ASCII
+# name leaves nothing, which is cheaper to check than running the regex
+_PROFILE_NAME_CHARS = string.ascii_letters.encode() + string.digits.encode() + b'_.@-'
+# Maps every ASCII byte outside that set to '_' for sanitize_filename
+_SANITIZE_TABLE = bytes(
+    c if c in _PROFILE_NAME_CHARS else ord('_') for c in range(128)
+) + bytes(range(128, 256))
+
+_VALID_ALGORITHMS = frozenset(('SHA1', 'SHA256', 'SHA512', 'MD5'))
 
 
 class Validators:
@@ -19,31 +38,19 @@ class Validators:
         Returns:
             tuple: (is_valid, error_message)
         """
-        if not name or not isinstance(name, str):
+        if not isinstance(name, str) or not name:
             return False, "Profile name cannot be empty"
         
         if len(name) > 255:
             return False, "Profile name too long (max 255 characters)"
         
-        # Check for valid characters (alphanumeric, dots, hyphens, underscores, @)
-        if not re.match(r'^[\w.@-]+
-
-
-MIGRATION GUIDE:
-================
-1. Copy the existing totp_crypto.py and TokenX.py to project root
-2. Copy resources_rc.py (Qt resources)
-3. Run: pip install -r requirements.txt
-4. Run: python main.py
-
-BENEFITS OF MODULAR STRUCTURE:
-==============================
-✓ Single Responsibility - each module has one purpose
-✓ Easier Testing - services can be tested independently
-✓ Better Maintainability - related code grouped together
-✓ Scalability - easy to add new features
-✓ Code Reusability - services can be used in other projects
-✓ Clear Dependencies - explicit imports show relationships, name):
+        # Check for valid characters (alphanumeric, dots, hyphens, underscores, @);
+        # only non-ASCII names need the Unicode-aware regex
+        if name.isascii():
+            valid = not name.encode().translate(None, _PROFILE_NAME_CHARS)
+        else:
+            valid = _RE_PROFILE_NAME.fullmatch(name) is not None
+        if not valid:
             return False, "Profile name contains invalid characters"
         
         return True, ""
@@ -59,7 +66,7 @@ BENEFITS OF MODULAR STRUCTURE:
         Returns:
             tuple: (is_valid, error_message)
         """
-        if not password or not isinstance(password, str):
+        if not isinstance(password, str) or not password:
             return False, "Password cannot be empty"
         
         if len(password) < 6:
@@ -81,28 +88,15 @@ BENEFITS OF MODULAR STRUCTURE:
         Returns:
             tuple: (is_valid, error_message)
         """
-        if not secret or not isinstance(secret, str):
+        if not isinstance(secret, str) or not secret:
             return False, "Secret cannot be empty"
         
+        # Far beyond any real secret; rejects huge pastes before the regex
+        if len(secret) > 1024:
+            return False, "Secret too long (max 1024 characters)"
+        
         # TOTP secrets should be base32 encoded
-        if not re.match(r'^[A-Z2-7]+={0,2}
-
-
-MIGRATION GUIDE:
-================
-1. Copy the existing totp_crypto.py and TokenX.py to project root
-2. Copy resources_rc.py (Qt resources)
-3. Run: pip install -r requirements.txt
-4. Run: python main.py
-
-BENEFITS OF MODULAR STRUCTURE:
-==============================
-✓ Single Responsibility - each module has one purpose
-✓ Easier Testing - services can be tested independently
-✓ Better Maintainability - related code grouped together
-✓ Scalability - easy to add new features
-✓ Code Reusability - services can be used in other projects
-✓ Clear Dependencies - explicit imports show relationships, secret.upper()):
+        if not _RE_TOTP_SECRET.fullmatch(secret):
             return False, "Invalid secret format (must be base32-encoded)"
         
         return True, ""
@@ -118,7 +112,7 @@ BENEFITS OF MODULAR STRUCTURE:
         Returns:
             tuple: (is_valid, error_message)
         """
-        if not file_path or not isinstance(file_path, str):
+        if not isinstance(file_path, str) or not file_path:
             return False, "File path cannot be empty"
         
         if len(file_path) > 260:  # Windows MAX_PATH
@@ -137,19 +131,20 @@ BENEFITS OF MODULAR STRUCTURE:
         Returns:
             tuple: (is_valid, error_message)
         """
-        if not uri or not isinstance(uri, str):
+        if not isinstance(uri, str) or not uri:
             return False, "URI cannot be empty"
         
+        if _RE_OTPAUTH.match(uri):
+            return True, ""
+        
+        # Work out which part failed only for invalid URIs
         if not uri.startswith("otpauth://"):
             return False, "Invalid URI format (must start with otpauth://)"
         
-        if not ("totp" in uri or "hotp" in uri):
+        if not uri.startswith(("otpauth://totp/", "otpauth://hotp/")):
             return False, "Unsupported OTP type (only TOTP/HOTP supported)"
         
-        if "secret=" not in uri:
-            return False, "Missing secret parameter in URI"
-        
-        return True, ""
+        return False, "Missing secret parameter in URI"
     
     @staticmethod
     def validate_profile_data(data):
@@ -178,18 +173,29 @@ BENEFITS OF MODULAR STRUCTURE:
         
         # Validate digits
         digits = data.get('digits', 6)
-        if not isinstance(digits, (int, str)) or int(digits) < 4 or int(digits) > 10:
+        try:
+            digits = int(digits) if isinstance(digits, (int, str)) else None
+        except ValueError:
+            digits = None
+        if digits is None:
+            return False, "Digits must be an integer"
+        if not 4 <= digits <= 10:
             return False, "Digits must be between 4 and 10"
         
         # Validate period
         period = data.get('period', 30)
-        if not isinstance(period, (int, str)) or int(period) < 10:
+        try:
+            period = int(period) if isinstance(period, (int, str)) else None
+        except ValueError:
+            period = None
+        if period is None:
+            return False, "Period must be an integer"
+        if period < 10:
             return False, "Period must be at least 10 seconds"
         
         # Validate algorithm
-        valid_algorithms = ['SHA1', 'SHA256', 'SHA512', 'MD5']
         algorithm = data.get('algorithm', 'SHA1').upper()
-        if algorithm not in valid_algorithms:
+        if algorithm not in _VALID_ALGORITHMS:
             return False, f"Invalid algorithm: {algorithm}"
         
         return True, ""
@@ -205,8 +211,12 @@ BENEFITS OF MODULAR STRUCTURE:
         Returns:
             str: Sanitized filename
         """
-        # Remove invalid characters
-        sanitized = re.sub(r'[^\w.@-]', '_', filename)
+        # Remove invalid characters; non-ASCII names need the regex for
+        # Unicode word characters
+        if filename.isascii():
+            sanitized = filename.encode().translate(_SANITIZE_TABLE).decode()
+        else:
+            sanitized = _RE_SANITIZE.sub('_', filename)
         
         # Limit length
         if len(sanitized) > 255:
@@ -229,10 +239,14 @@ BENEFITS OF MODULAR STRUCTURE:
         if not file_path:
             return False, "File path not specified"
         
-        if not os.path.exists(file_path):
+        # One stat gives both existence and file type; os.path.exists also
+        # reports unreadable or malformed paths as missing
+        try:
+            mode = os.stat(file_path).st_mode
+        except (OSError, ValueError):
             return False, "Master key file not found"
         
-        if not os.path.isfile(file_path):
+        if not stat.S_ISREG(mode):
             return False, "Master key path is not a file"
         
         if not os.access(file_path, os.R_OK):
@@ -0,0 +1,28 @@
+"""
+Thread pool worker for running blocking calls off the GUI thread.
+"""
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """Signals for Worker."""
+    
+    finished = pyqtSignal(object, str)  # result, error
+
+
+class Worker(QRunnable):
+    """Runs fn(*args) on a thread pool and reports the result or error message."""
+    
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+    
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.finished.emit(None, str(e) or type(e).__name__)
+            return
+        self.signals.finished.emit(result, "")